@@ -0,0 +1,241 @@
+## @package benchmark
+#  Benchmarks for wininfparser
+#
+#  Generates deterministic synthetic INF files, measures parse/save/search speed and memory
+#  and writes the results to a JSON file, so results of two releases can be compared.
+#  \code{.sh}
+#  python benchmarks/benchmark.py --sizes 10x100 100x100 --output results.json
+#  python benchmarks/benchmark.py --sizes 10x100 100x100 --compare results.json
+#  \endcode
+#
+import os
+import sys
+import json
+import time
+import random
+import platform
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from wininfparser import WinINF, INFDiagnostics
+
+
+## Generates synthetic INF file content
+#  @param Sections (int) number of sections
+#  @param KeysPerSection (int) number of lines in each section
+#  @param ValueLength (int) length of values
+#  @param QuotedDensity (float) part of lines with quoted values
+#  @param CommentDensity (float) part of lines with comments
+#  @param StringsKeys (int) number of keys in [Strings] section
+#  @param Seed (int) random seed, the same seed gives the same content
+#  @return str
+def GenerateINF(Sections=10, KeysPerSection=100, ValueLength=32, QuotedDensity=0.1, CommentDensity=0.1, StringsKeys=0, Seed=0):
+    Random = random.Random(Seed)
+    Alphabet = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_.,\\&"
+
+    def Word(n):
+        return "".join(Random.choice(Alphabet) for i in range(n))
+
+    Lines = [";", "; Synthetic INF file", ";", "", "[Version]", 'Signature="$WINDOWS NT$"', "Provider=%Provider%", "Class=Display",
+             "DriverVer=08/20/2004,6.14.10.3889", ""]
+
+    for s in range(Sections):
+        Lines.append("[Section{0}]".format(s))
+        for k in range(KeysPerSection):
+            r = Random.random()
+            if r < CommentDensity / 2:
+                Lines.append("; " + Word(ValueLength))
+                continue
+
+            Value = Word(ValueLength)
+            if Random.random() < QuotedDensity:
+                Value = '"{0}; {1}"'.format(Value[:ValueLength // 2], Value[ValueLength // 2:])
+
+            Line = "Key{0}_{1} = {2}".format(s, k, Value)
+            if Random.random() < CommentDensity / 2:
+                Line += " ; " + Word(8)
+            Lines.append(Line)
+        Lines.append("")
+
+    Lines.append("[Strings]")
+    Lines.append('Provider="Benchmark Corporation"')
+    for k in range(StringsKeys):
+        Lines.append('String{0} = "{1}"'.format(k, Word(ValueLength)))
+    Lines.append("")
+
+    return "\n".join(Lines)
+
+
+## Runs function several times and returns the best time in seconds
+#  @param Function callable
+#  @param Repeat (int)
+#  @return float
+def Measure(Function, Repeat):
+    Best = None
+    for i in range(Repeat):
+        Start = time.perf_counter()
+        Function()
+        Elapsed = time.perf_counter() - Start
+        if Best is None or Elapsed < Best:
+            Best = Elapsed
+    return Best
+
+
+## Parses file with silent diagnostics
+#  @param Name (str)
+#  @param codec (str)
+#  @return WinINF
+def Parse(Name, codec):
+    Inf = WinINF()
+    Inf.SetDiagnostics(INFDiagnostics(INFDiagnostics.silent))
+    Inf.ParseFile(Name, codec)
+    return Inf
+
+
+## Runs all benchmarks for one file size
+#  @param Sections (int)
+#  @param KeysPerSection (int)
+#  @param Args parsed command line arguments
+#  @param Directory (str) directory for temporary files
+#  @return list of dict
+def RunSize(Sections, KeysPerSection, Args, Directory):
+    Text = GenerateINF(Sections, KeysPerSection, Args.value_length, Args.quoted, Args.comments, Args.strings, Args.seed)
+    Name = os.path.join(Directory, "bench_{0}x{1}.inf".format(Sections, KeysPerSection))
+    with open(Name, "w", encoding=Args.encoding) as f:
+        f.write(Text)
+
+    Size = "{0}x{1}".format(Sections, KeysPerSection)
+    Lines = Text.count("\n") + 1
+    Bytes = os.path.getsize(Name)
+    Results = []
+
+    def Add(Operation, Seconds, Count, PeakBytes=None):
+        Result = {"size": Size, "lines": Lines, "bytes": Bytes, "operation": Operation, "seconds": Seconds,
+                  "ops_per_second": Count / Seconds if Seconds else None}
+        if PeakBytes is not None:
+            Result["peak_bytes"] = PeakBytes
+        Results.append(Result)
+
+    Add("ParseFile", Measure(lambda: Parse(Name, Args.encoding), Args.repeat), 1)
+
+    tracemalloc.start()
+    Inf = Parse(Name, Args.encoding)
+    PeakBytes = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    Results[-1]["peak_bytes"] = PeakBytes
+
+    SaveName = os.path.join(Directory, "bench_save.inf")
+    Add("Save", Measure(lambda: Inf.Save(SaveName, Args.encoding), Args.repeat), 1)
+
+    Names = ["Section{0}".format(s) for s in range(Sections)]
+    Add("GetSection", Measure(lambda: [Inf.GetSection(n) for n in Names], Args.repeat), len(Names))
+
+    Section = Inf.GetSection(Names[-1]) if Names else Inf.GetSection("Strings")
+    Keys = [k for k, v, c in Section if k]
+    Add("GetExactKeyIndex", Measure(lambda: [Section.GetExactKeyIndex(k) for k in Keys], Args.repeat), len(Keys))
+
+    Probes = Keys[::max(1, len(Keys) // 100)]
+    Add("Find", Measure(lambda: [Section.Find(k) for k in Probes], Args.repeat), len(Probes))
+
+    Add("SearchKeyIter", Measure(lambda: sum(1 for r in Section.SearchKeyIter("Key")), Args.repeat), len(Keys))
+
+    Add("Iteration", Measure(lambda: sum(1 for s in Inf for r in s), Args.repeat), Lines)
+
+    return Results
+
+
+## Returns settings that change the generated files, results are comparable only with the same settings
+#  @param Args parsed command line arguments
+#  @return dict
+def GetSettings(Args):
+    return {"encoding": Args.encoding, "value_length": Args.value_length, "quoted": Args.quoted,
+            "comments": Args.comments, "strings": Args.strings, "seed": Args.seed}
+
+
+## Returns settings that differ from the settings of previous results
+#  Files without stored settings are checked by encoding only
+#  @param Settings (dict) see GetSettings
+#  @param Report (dict) previous report
+#  @return list of str
+def CheckSettings(Settings, Report):
+    Previous = Report.get("settings", {"encoding": Report.get("encoding")})
+    return ["{0}: {1} -> {2}".format(Name, Previous[Name], Value) for Name, Value in Settings.items()
+            if Name in Previous and Previous[Name] != Value]
+
+
+## Compares results with previous results
+#  @param Results list of dict
+#  @param Previous list of dict
+#  @param Threshold (float) allowed slowdown, 0.2 - 20%
+#  @return list of str (regressions)
+def Compare(Results, Previous, Threshold):
+    Old = {(r["size"], r["operation"]): r for r in Previous}
+    Regressions = []
+    for r in Results:
+        o = Old.get((r["size"], r["operation"]))
+        if o is None:
+            continue
+
+        if r["seconds"] > o["seconds"] * (1 + Threshold):
+            Regressions.append("{0} {1}: {2:.6f}s -> {3:.6f}s".format(r["size"], r["operation"], o["seconds"], r["seconds"]))
+
+        if "peak_bytes" in r and "peak_bytes" in o and r["peak_bytes"] > o["peak_bytes"] * (1 + Threshold):
+            Regressions.append("{0} {1}: {2} -> {3} bytes".format(r["size"], r["operation"], o["peak_bytes"], r["peak_bytes"]))
+    return Regressions
+
+
+def main():
+    Parser = argparse.ArgumentParser(description="wininfparser benchmarks")
+    Parser.add_argument("--sizes", nargs="+", default=["10x100", "100x100", "10x5000"], help="SECTIONSxKEYS")
+    Parser.add_argument("--value-length", type=int, default=32)
+    Parser.add_argument("--quoted", type=float, default=0.1, help="part of quoted values")
+    Parser.add_argument("--comments", type=float, default=0.1, help="part of lines with comments")
+    Parser.add_argument("--strings", type=int, default=1000, help="number of keys in [Strings]")
+    Parser.add_argument("--encoding", default="utf-8", help="for example utf-8 or utf-16")
+    Parser.add_argument("--seed", type=int, default=0)
+    Parser.add_argument("--repeat", type=int, default=3)
+    Parser.add_argument("--output", help="JSON file for results")
+    Parser.add_argument("--compare", help="JSON file with previous results")
+    Parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown for --compare")
+    Args = Parser.parse_args()
+
+    Results = []
+    with tempfile.TemporaryDirectory() as Directory:
+        for Size in Args.sizes:
+            Sections, KeysPerSection = (int(n) for n in Size.lower().split("x"))
+            for r in RunSize(Sections, KeysPerSection, Args, Directory):
+                print("{0:>10} {1:<18} {2:12.6f}s {3:>14}".format(r["size"], r["operation"], r["seconds"],
+                      "{0:,.0f}/s".format(r["ops_per_second"]) if r["ops_per_second"] else "-"))
+                Results.append(r)
+
+    Settings = GetSettings(Args)
+    Report = {"python": platform.python_version(), "platform": platform.platform(), "encoding": Args.encoding,
+              "settings": Settings, "results": Results}
+    if Args.output:
+        with open(Args.output, "w", encoding="utf-8") as f:
+            json.dump(Report, f, indent=2)
+
+    if Args.compare:
+        with open(Args.compare, encoding="utf-8") as f:
+            Previous = json.load(f)
+
+        Differences = CheckSettings(Settings, Previous)
+        if Differences:
+            print("Error: results of [{0}] were measured with other settings, not compared:".format(Args.compare))
+            for d in Differences:
+                print("   ", d)
+            return 2
+
+        Regressions = Compare(Results, Previous["results"], Args.threshold)
+        for r in Regressions:
+            print("Regression:", r)
+        if Regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
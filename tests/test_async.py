@@ -0,0 +1,78 @@
+## @package test_async
+#  asyncio wrapper tests
+#
+import os
+import sys
+import asyncio
+import tempfile
+import unittest
+import concurrent.futures
+
+Directory = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(Directory, ".."))
+
+from wininfparser import WinINF
+
+
+Text = "[Version]\nSignature=\"$Windows NT$\"\n\n[Files]\na.sys\n"
+
+
+class AsyncTest(unittest.TestCase):
+    def setUp(self):
+        self.Temp = tempfile.TemporaryDirectory()
+        self.Names = []
+        for i in range(5):
+            Name = os.path.join(self.Temp.name, "{0}.inf".format(i))
+            with open(Name, "w", encoding="utf-8", newline="") as f:
+                f.write(Text.replace("a.sys", "{0}.sys".format(i)))
+            self.Names.append(Name)
+
+    def tearDown(self):
+        self.Temp.cleanup()
+
+    def test_parse_file(self):
+        async def Parse():
+            with concurrent.futures.ThreadPoolExecutor(2) as Executor:
+                return await asyncio.gather(WinINF.ParseFileAsync(self.Names[0], "utf-8"),
+                                            WinINF.ParseFileAsync(self.Names[1], "utf-8", fKeepRaw=True, executor=Executor))
+
+        First, Second = asyncio.run(Parse())
+        self.assertEqual(list(First.GetSection("Files"))[0][0], "0.sys")
+        self.assertEqual(First.GetFileName(), self.Names[0])
+        self.assertEqual(Second.GetText(), Text.replace("a.sys", "1.sys"))
+
+    def test_parse_many(self):
+        Missing = os.path.join(self.Temp.name, "missing.inf")
+
+        async def Parse():
+            return [Result async for Result in WinINF.ParseManyAsync(self.Names + [Missing], "utf-8", limit=2)]
+
+        Results = asyncio.run(Parse())
+        self.assertEqual(sorted(Name for Name, Inf, Messages in Results), sorted(self.Names + [Missing]))
+        for Name, Inf, Messages in Results:
+            if Name == Missing:
+                self.assertIsInstance(Inf, Exception)
+            else:
+                self.assertEqual(list(Inf.GetSection("Files"))[0][0], os.path.basename(Name).replace(".inf", ".sys"))
+
+    def test_parse_many_stop(self):
+        async def Parse():
+            async for Result in WinINF.ParseManyAsync(self.Names, "utf-8", limit=1):
+                return Result
+
+        Name, Inf, Messages = asyncio.run(Parse())
+        self.assertEqual(Name, self.Names[0])
+
+    def test_save(self):
+        Inf = WinINF()
+        Inf.ParseFile(self.Names[0], "utf-8")
+        Name = os.path.join(self.Temp.name, "new.inf")
+        self.assertTrue(asyncio.run(Inf.SaveAsync(Name, "utf-8")))
+
+        Saved = WinINF()
+        Saved.ParseFile(Name, "utf-8")
+        self.assertEqual([list(s) for s in Saved], [list(s) for s in Inf])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+## @package test_cache
+#  INFCache tests
+#
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+Directory = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(Directory, ".."))
+
+from wininfparser import WinINF, INFCache
+
+
+Text = "[Version]\nSignature=\"$Windows NT$\"\n\n[Files]\na.sys\n"
+
+
+class CacheTest(unittest.TestCase):
+    def setUp(self):
+        self.Temp = tempfile.TemporaryDirectory()
+        self.Cache = INFCache(os.path.join(self.Temp.name, "cache"))
+        self.Name = os.path.join(self.Temp.name, "a.inf")
+        self.Write(Text)
+
+    def tearDown(self):
+        self.Temp.cleanup()
+
+    def Write(self, Text):
+        with open(self.Name, "w", encoding="utf-8", newline="") as f:
+            f.write(Text)
+
+    ## Parses the file with the cache, returns file and number of parsed files
+    def Parse(self):
+        with mock.patch.object(WinINF, "ParseFile", autospec=True, side_effect=WinINF.ParseFile) as ParseFile:
+            Inf = self.Cache.ParseFile(self.Name, "utf-8")
+        return Inf, ParseFile.call_count
+
+    def test_hit(self):
+        Inf, Count = self.Parse()
+        self.assertEqual(Count, 1)
+        self.assertGreater(self.Cache.GetSize(), 0)
+
+        Cached, Count = self.Parse()
+        self.assertEqual(Count, 0)
+        self.assertIsNot(Cached, Inf)
+        self.assertEqual(Cached.GetFileName(), self.Name)
+        self.assertEqual([list(s) for s in Cached], [list(s) for s in Inf])
+
+    def test_stale_size(self):
+        self.Parse()
+        self.Write(Text + "b.sys\n")
+        Inf, Count = self.Parse()
+        self.assertEqual(Count, 1)
+        self.assertEqual(Inf.GetSection("Files").GetSize(), 2)
+
+    def test_stale_mtime(self):
+        self.Parse()
+        st = os.stat(self.Name)
+        self.Write(Text.replace("a.sys", "b.sys"))
+        os.utime(self.Name, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        Inf, Count = self.Parse()
+        self.assertEqual(Count, 1)
+        self.assertEqual(list(Inf.GetSection("Files"))[0][0], "b.sys")
+
+    def test_version(self):
+        self.Parse()
+        with mock.patch.object(INFCache, "Version", INFCache.Version + 1):
+            Inf, Count = self.Parse()
+            self.assertEqual(Count, 1)
+            Inf, Count = self.Parse()
+            self.assertEqual(Count, 0)
+
+    def test_invalidate(self):
+        self.Parse()
+        self.Cache.Invalidate(self.Name)
+        self.assertEqual(self.Cache.GetSize(), 0)
+        Inf, Count = self.Parse()
+        self.assertEqual(Count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+## @package test_columns
+#  INFColumns tests
+#
+import os
+import sys
+import struct
+import tempfile
+import unittest
+
+Directory = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(Directory, ".."))
+
+from wininfparser import WinINF, INFColumns, INFDiagnostics
+
+
+Text = """[Version]
+Signature="$Windows NT$" ; signature
+
+[Files]
+a.sys
+b.sys,,,2
+"""
+
+
+## Returns columns of one parsed file
+#  @return INFColumns
+def GetColumns():
+    Inf = WinINF()
+    Inf.SetDiagnostics(INFDiagnostics(INFDiagnostics.silent))
+    Inf.ParseBytes(Text.encode("utf-8"), "utf-8", "a.inf")
+    Columns = INFColumns()
+    Columns.AddFile(Inf)
+    return Columns
+
+
+class ColumnsTest(unittest.TestCase):
+    def setUp(self):
+        self.Temp = tempfile.TemporaryDirectory()
+        self.Name = os.path.join(self.Temp.name, "corpus.infcol")
+        self.Columns = GetColumns()
+        self.Columns.Save(self.Name)
+
+    def tearDown(self):
+        self.Temp.cleanup()
+
+    def Load(self, fMap=True):
+        Diagnostics = INFDiagnostics(INFDiagnostics.collect)
+        return INFColumns.Load(self.Name, fMap, Diagnostics), Diagnostics
+
+    def Write(self, Data):
+        with open(self.Name, "wb") as f:
+            f.write(Data)
+
+    def Read(self):
+        with open(self.Name, "rb") as f:
+            return f.read()
+
+    def test_round_trip(self):
+        for fMap in (True, False):
+            Columns, Diagnostics = self.Load(fMap)
+            self.assertEqual(list(Columns.Rows()), list(self.Columns.Rows()))
+            self.assertEqual(Columns.GetCode("a.sys"), self.Columns.GetCode("a.sys"))
+            self.assertEqual(Columns.GetFileCode("a.inf"), 0)
+            Columns.Close()
+            self.assertEqual(list(Columns.Rows()), list(self.Columns.Rows()))
+            self.assertEqual(len(Diagnostics), 0)
+
+    def test_close_with_column(self):
+        Columns, Diagnostics = self.Load()
+        Keys = Columns.Column("key")
+        Rows = list(Columns.Rows())
+        Columns.Close()
+        self.assertEqual(list(Columns.Rows()), Rows)
+        self.assertRaises(ValueError, len, Keys)
+        os.remove(self.Name)
+
+    def test_close_with_slice(self):
+        Columns, Diagnostics = self.Load()
+        Keys = Columns.Column("key")[1:]
+        Columns.Close()
+        self.assertEqual(list(Keys), list(self.Columns.Column("key")[1:]))
+
+    def test_truncated(self):
+        Data = self.Read()
+        for Size in (10, 60, len(Data) - 4):
+            self.Write(Data[:Size])
+            Columns, Diagnostics = self.Load()
+            self.assertIsNone(Columns)
+            self.assertEqual(Diagnostics.Count(INFDiagnostics.invalid_format), 1)
+
+    def test_bad_magic(self):
+        self.Write(b"INFXXX" + self.Read()[6:])
+        Columns, Diagnostics = self.Load()
+        self.assertIsNone(Columns)
+        self.assertEqual(Diagnostics.Count(INFDiagnostics.invalid_format), 1)
+
+    def test_bad_version(self):
+        Data = self.Read()
+        self.Write(Data[:8] + struct.pack("<I", INFColumns.Version + 1) + Data[12:])
+        Columns, Diagnostics = self.Load()
+        self.assertIsNone(Columns)
+        self.assertEqual(Diagnostics.Count(INFDiagnostics.unsupported_version), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+## @package test_database
+#  INFDatabase tests
+#
+import os
+import sys
+import tempfile
+import unittest
+
+Directory = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(Directory, ".."))
+
+from wininfparser import INFDatabase, INFError, INFDiagnostics
+
+
+Text = """[Version]
+Signature="$Windows NT$"
+Class=Net
+Provider=%Contoso%
+DriverVer=07/21/2020,1.2.3.4
+
+[Manufacturer]
+%Contoso%=Models,NTamd64
+
+[Models.NTamd64]
+%Device%=Install,PCI\\VEN_1234&DEV_0001
+
+[Install]
+CopyFiles=Files
+
+[Strings]
+Contoso="Contoso"
+Device="Contoso Device"
+"""
+
+
+class DatabaseTest(unittest.TestCase):
+    def setUp(self):
+        self.Temp = tempfile.TemporaryDirectory()
+        self.Database = INFDatabase(":memory:")
+        self.Names = [os.path.join(self.Temp.name, Name) for Name in ("a.inf", "b.inf")]
+        for Name in self.Names:
+            self.Write(Name, Text)
+
+    def tearDown(self):
+        self.Database.Close()
+        self.Temp.cleanup()
+
+    def Write(self, Name, Text, Delta=0):
+        with open(Name, "w", encoding="utf-8", newline="") as f:
+            f.write(Text)
+        if Delta:
+            st = os.stat(Name)
+            os.utime(Name, ns=(st.st_atime_ns, st.st_mtime_ns + Delta))
+
+    def Count(self, Table):
+        return self.Database.Execute("SELECT COUNT(*) FROM {0}".format(Table))[0][0]
+
+    def test_insert(self):
+        Result = self.Database.Update(self.Names)
+        self.assertEqual(Result, {"changed": self.Names, "unchanged": 0, "removed": [], "failed": {}})
+        self.assertEqual(self.Database.Files(), self.Names)
+        self.assertEqual(self.Database.Execute("SELECT class, provider, driver_date, driver_version FROM files"),
+                         [("Net", "Contoso", "2020-07-21", "1.2.3.4")] * 2)
+        self.assertEqual(self.Database.Execute("SELECT install, description FROM hardware_ids WHERE hardware_id = ?",
+                                               ("pci\\ven_1234&dev_0001",)),
+                         [("Install", "Contoso Device")] * 2)
+        self.assertEqual(self.Count("sections"), 10)
+
+    def test_upsert(self):
+        self.Database.Update(self.Names)
+        Rows = self.Count("rows")
+        self.Write(self.Names[0], Text.replace("Class=Net", "Class=Display"), 10**9)
+
+        Result = self.Database.Update(self.Names)
+        self.assertEqual(Result["changed"], [self.Names[0]])
+        self.assertEqual(Result["unchanged"], 1)
+        self.assertEqual(self.Database.Execute("SELECT path FROM files WHERE class = 'display'"), [(self.Names[0],)])
+        self.assertEqual(self.Count("files"), 2)
+        self.assertEqual(self.Count("sections"), 10)
+        self.assertEqual(self.Count("rows"), Rows)
+
+    def test_unchanged(self):
+        self.Database.Update(self.Names)
+        self.assertEqual(self.Database.Update(self.Names)["unchanged"], 2)
+
+        self.Write(self.Names[0], Text, 10**9)
+        Result = self.Database.Update(self.Names)
+        self.assertEqual(Result["changed"], [])
+        self.assertEqual(Result["unchanged"], 2)
+        self.assertFalse(self.Database.AddFile(self.Names[0]))
+
+    def test_prune(self):
+        self.Database.Update(self.Names)
+        Result = self.Database.Update(self.Names[1:], fPrune=True)
+        self.assertEqual(Result["removed"], [self.Names[0]])
+        self.assertEqual(self.Database.Files(), self.Names[1:])
+        self.assertEqual(self.Count("sections"), 5)
+        self.assertEqual(self.Count("hardware_ids"), 1)
+
+        self.Database.RemoveFile(self.Names[1])
+        for Table in ("files", "sections", "rows", "hardware_ids"):
+            self.assertEqual(self.Count(Table), 0)
+
+    def test_failed(self):
+        Name = os.path.join(self.Temp.name, "missing.inf")
+        Result = self.Database.Update([Name])
+        self.assertEqual(list(Result["failed"]), [Name])
+
+    def test_version(self):
+        Name = os.path.join(self.Temp.name, "drivers.db")
+        Database = INFDatabase(Name)
+        Database.Execute("PRAGMA user_version = 99")
+        Database.Close()
+
+        with self.assertRaises(INFError) as Context:
+            INFDatabase(Name)
+        self.assertEqual(Context.exception.Diagnostic.Code, INFDiagnostics.unsupported_version)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+## @package test_edit
+#  WinINF.ApplyEdit tests
+#
+#  After every edit the file must have the same text, sections and rows as the edited text parsed from scratch.
+#
+import os
+import sys
+import random
+import unittest
+
+Directory = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(Directory, ".."))
+
+from wininfparser import WinINF, INFDiagnostics
+
+
+Pieces = ["[A]\n", "[b] ;c\n", "[ A ]\n", "k=v\n", 'k = "x;y" ; cm\n', "line\n", ";comment\n", "\n", "  \n",
+          "bad]line\n", "[Strings]\n", "x=1\n", "[unclosed\n", "[]\n"]
+
+
+## Parses text with original text kept
+#  @param Text (str)
+#  @return WinINF
+def Parse(Text):
+    Inf = WinINF()
+    Inf.SetDiagnostics(INFDiagnostics(INFDiagnostics.silent))
+    Inf.ParseBytes(Text.encode("utf-8"), "utf-8", fKeepRaw=True)
+    return Inf
+
+
+## Returns text after replacing lines StartLine:EndLine, the same way as ApplyEdit
+#  @param Text (str)
+#  @param StartLine (int)
+#  @param EndLine (int)
+#  @param NewText (str)
+#  @return str
+def Replace(Text, StartLine, EndLine, NewText):
+    if NewText and not NewText.endswith("\n"):
+        NewText += "\n"
+    Lines = Text.splitlines(True)
+    Before = "".join(Lines[:StartLine])
+    After = "".join(Lines[EndLine:])
+    if Before and not Before.endswith("\n") and (NewText or After):
+        Before += "\n"
+    return Before + NewText + After
+
+
+## Returns names and rows of all sections
+#  @param Inf (WinINF)
+#  @return list
+def GetRows(Inf):
+    return [(s.GetName(), s.GetType(), list(s)) for s in Inf]
+
+
+class ApplyEditTest(unittest.TestCase):
+    def CheckEdit(self, Inf, Text, StartLine, EndLine, NewText):
+        Old = {id(s) for s in Inf}
+        Inserted = Inf.ApplyEdit(StartLine, EndLine, NewText)
+        Text = Replace(Text, StartLine, EndLine, NewText)
+        Reference = Parse(Text)
+
+        self.assertEqual(Inf.GetText(), Text)
+        self.assertEqual(GetRows(Inf), GetRows(Reference))
+        self.assertEqual(list(Inf.Sections()), list(Reference.Sections()))
+        self.assertEqual(Inf.Count(), Reference.Count())
+        self.assertEqual([Inf.IndexOf(s) for s in Inf], list(range(Inf.Count())))
+        for Name in Reference.Sections():
+            self.assertEqual(len(Inf.GetSections(Name, False)), len(Reference.GetSections(Name, False)))
+        for Line in range(len(Text.splitlines()) + 1):
+            a = Inf.GetSectionAtLine(Line)
+            b = Reference.GetSectionAtLine(Line)
+            self.assertEqual(None if a is None else a.GetName(), None if b is None else b.GetName())
+        for Section in Inserted:
+            self.assertNotIn(id(Section), Old)
+        return Text
+
+    def test_replace_row(self):
+        Text = "[A]\nk=1\n[B]\nk=2\n"
+        Inf = Parse(Text)
+        B = Inf.GetSection("B")
+        self.CheckEdit(Inf, Text, 1, 2, "k=3\n")
+        self.assertIs(Inf.GetSection("B"), B)
+
+    def test_split_and_merge(self):
+        Text = "[A]\nk=1\nk=2\n[B]\nk=3\n"
+        Inf = Parse(Text)
+        Text = self.CheckEdit(Inf, Text, 2, 2, "[C]\n")
+        self.assertEqual(list(Inf.Sections()), ["A", "C", "B"])
+        Text = self.CheckEdit(Inf, Text, 2, 3, "")
+        self.assertEqual(list(Inf.Sections()), ["A", "B"])
+
+    def test_before_first_section(self):
+        Text = ";head\n[A]\nk=1"
+        Inf = Parse(Text)
+        Text = self.CheckEdit(Inf, Text, 0, 0, "\nstray\n")
+        self.CheckEdit(Inf, Text, 3, 4, "k=2")
+
+    def test_changed_sections(self):
+        Text = "[A]\nk=1\n[B]\nk=2\nj=5\n[C]\nk=3\n"
+        Inf = Parse(Text)
+        self.assertIs(Inf.GetSectionAtLine(2), Inf.GetSection("B"))
+        Inf.GetSection("A").AddData("x", "1")
+        Inf.GetSection("B").RemoveKey("k")
+        self.CheckEdit(Inf, Inf.GetText(), 5, 6, "k=4\n")
+        Inf.RemoveSection(Inf.GetSection("A"))
+        self.CheckEdit(Inf, Inf.GetText(), 0, 1, "[D]\n")
+
+    def test_random_edits(self):
+        Random = random.Random(0)
+
+        def Document():
+            return "".join(Random.choice(Pieces) for i in range(Random.randint(0, 12)))
+
+        for Iteration in range(300):
+            Text = Document()
+            if Text and Random.random() < 0.3:
+                Text = Text[:-1]
+            Inf = Parse(Text)
+            for Edit in range(Random.randint(1, 5)):
+                Count = len(Text.splitlines())
+                StartLine = Random.randint(0, Count)
+                EndLine = Random.randint(StartLine, Count)
+                Text = self.CheckEdit(Inf, Text, StartLine, EndLine, Document())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+## @package test_graph
+#  INFGraph tests
+#
+import os
+import sys
+import unittest
+
+Directory = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(Directory, ".."))
+
+from wininfparser import WinINF, INFDiagnostics
+
+
+Text = """[Version]
+Signature="$Windows NT$"
+
+[Manufacturer]
+%Mfg%=Contoso,NTamd64
+
+[Contoso.NTamd64]
+%Device%=Install,PCI\\VEN_1234
+
+[Install]
+CopyFiles=Files
+
+[Files]
+a.sys
+
+[Strings]
+Mfg="Contoso"
+Device="Device"
+"""
+
+
+## Parses text
+#  @param Text (str)
+#  @return WinINF
+def Parse(Text):
+    Inf = WinINF()
+    Inf.SetDiagnostics(INFDiagnostics(INFDiagnostics.silent))
+    Inf.ParseBytes(Text.encode("utf-8"), "utf-8")
+    return Inf
+
+
+class GraphTest(unittest.TestCase):
+    def test_references(self):
+        Graph = Parse(Text).GetGraph()
+        self.assertEqual(Graph.GetReferences("Manufacturer"), [("models", "Contoso.NTamd64")])
+        self.assertEqual(Graph.GetReferences("Install"), [("copyfiles", "Files")])
+        self.assertEqual(Graph.GetClosure("Contoso"), ["Contoso.NTamd64", "Install", "Files"])
+        self.assertEqual(Graph.GetUnreachable(), [])
+
+    def test_update(self):
+        Inf = Parse(Text + "[Extra]\nb.sys\n")
+        Graph = Inf.GetGraph()
+        self.assertEqual(Graph.GetUnreachable(), ["Extra"])
+
+        Inf.GetSection("Install").AddData("AddReg", "Extra")
+        self.assertIs(Inf.GetGraph(), Graph)
+        self.assertEqual(Graph.GetReferences("Install"), [("copyfiles", "Files"), ("addreg", "Extra")])
+        self.assertEqual(Graph.GetReferencedBy("Extra"), [("Install", "addreg")])
+        self.assertEqual(Graph.GetUnreachable(), [])
+
+        Inf.RemoveSection(Inf.GetSection("Files"))
+        Inf.GetGraph()
+        self.assertEqual(Graph.GetDangling(), [("Install", "copyfiles", "Files")])
+
+    def test_manufacturer_without_value(self):
+        for Row in ("%Contoso%", "Contoso"):
+            Graph = Parse(Text.replace("%Mfg%=Contoso,NTamd64", Row).replace("[Contoso.NTamd64]", "[Contoso]")).GetGraph()
+            self.assertEqual(Graph.GetReferences("Manufacturer"), [("models", "Contoso")])
+            self.assertEqual(Graph.GetUnreachable(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+## @package test_hardware
+#  INFHardwareIndex tests
+#
+import os
+import sys
+import tempfile
+import unittest
+
+Directory = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(Directory, ".."))
+
+from wininfparser import WinINF, INFHardwareIndex, INFDiagnostics
+
+
+Text = """[Version]
+Signature="$Windows NT$"
+
+[Manufacturer]
+%Contoso%=Contoso,NTamd64
+Fabrikam
+
+[Contoso.NTamd64]
+%Device% = Install, PCI\\VEN_1234&DEV_0001, PCI\\VEN_1234&CC_0200
+%Device2%=Install2,PCI\\VEN_1234&DEV_0002
+
+[Fabrikam]
+"Fabrikam Device"=FabInstall,USB\\VID_0001&PID_0002
+
+[Strings]
+Contoso="Contoso"
+Device="Contoso Device"
+Device2="Contoso Device 2"
+"""
+
+
+## Parses text
+#  @param Text (str)
+#  @param Name (str)
+#  @return WinINF
+def Parse(Text, Name):
+    Inf = WinINF()
+    Inf.SetDiagnostics(INFDiagnostics(INFDiagnostics.silent))
+    Inf.ParseBytes(Text.encode("utf-8"), "utf-8", Name)
+    return Inf
+
+
+class HardwareIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.Index = INFHardwareIndex([Parse(Text, "a.inf"), Parse(Text.replace("DEV_0002", "DEV_0003"), "b.inf")])
+
+    def test_get_ids(self):
+        self.assertEqual(INFHardwareIndex.GetIDs(Parse(Text, "a.inf")), [
+            ("PCI\\VEN_1234&DEV_0001", "Contoso.NTamd64", "Install", "Contoso Device"),
+            ("PCI\\VEN_1234&CC_0200", "Contoso.NTamd64", "Install", "Contoso Device"),
+            ("PCI\\VEN_1234&DEV_0002", "Contoso.NTamd64", "Install2", "Contoso Device 2"),
+            ("USB\\VID_0001&PID_0002", "Fabrikam", "FabInstall", "Fabrikam Device"),
+        ])
+
+    def test_find(self):
+        self.assertEqual(self.Index.Files(), ["a.inf", "b.inf"])
+        self.assertEqual(self.Index.Count(), 5)
+        self.assertEqual(self.Index.Find("pci\\ven_1234&dev_0001"), [
+            ("a.inf", "Contoso.NTamd64", "Install", "Contoso Device"),
+            ("b.inf", "Contoso.NTamd64", "Install", "Contoso Device"),
+        ])
+        self.assertEqual(self.Index.Find("PCI\\VEN_1234&DEV_0003"), [("b.inf", "Contoso.NTamd64", "Install2", "Contoso Device 2")])
+        self.assertEqual(self.Index.Find("PCI\\VEN_9999"), [])
+
+    def test_find_prefix(self):
+        self.assertEqual(sorted({Key for Key, Entry in self.Index.FindPrefix("PCI\\VEN_1234&DEV")}),
+                         ["pci\\ven_1234&dev_0001", "pci\\ven_1234&dev_0002", "pci\\ven_1234&dev_0003"])
+        self.assertEqual(list(self.Index.FindPrefix("ACPI")), [])
+
+    def test_remove_and_replace(self):
+        self.Index.RemoveFile("b.inf")
+        self.assertEqual(self.Index.Find("PCI\\VEN_1234&DEV_0003"), [])
+        self.assertEqual(len(self.Index.Find("PCI\\VEN_1234&DEV_0001")), 1)
+        self.assertEqual(list(self.Index.FindPrefix("pci\\ven_1234&dev_0003")), [])
+
+        self.Index.AddFile(Parse(Text.replace("Install2", "Other"), "a.inf"))
+        self.assertEqual(self.Index.Find("PCI\\VEN_1234&DEV_0002"), [("a.inf", "Contoso.NTamd64", "Other", "Contoso Device 2")])
+        self.assertEqual(self.Index.Count(), 4)
+
+    def test_save_load(self):
+        with tempfile.TemporaryDirectory() as Temp:
+            Name = os.path.join(Temp, "index.json")
+            self.Index.Save(Name)
+            Index = INFHardwareIndex()
+            self.assertTrue(Index.Load(Name))
+            self.assertEqual(Index.Files(), self.Index.Files())
+            self.assertEqual(list(Index.FindPrefix("")), list(self.Index.FindPrefix("")))
+
+
+if __name__ == "__main__":
+    unittest.main()
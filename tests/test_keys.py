@@ -0,0 +1,102 @@
+## @package test_keys
+#  INFsection key index tests
+#
+#  After every change GetExactKeyIndex must give the same result as a linear search.
+#
+import os
+import sys
+import random
+import unittest
+
+Directory = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(Directory, ".."))
+
+from wininfparser import INFsection
+
+
+Keys = ["CopyFiles", "copyfiles", "AddReg", "Include", "Needs", "x"]
+
+
+## Returns position of the key by linear search
+#  @param Section (INFsection)
+#  @param k (str)
+#  @param p (int)
+#  @param fIgnoreCase (bool)
+#  @return int
+def FindKey(Section, k, p, fIgnoreCase):
+    for Index, (Key, Value, Comment) in enumerate(Section):
+        if Index >= p and (Key == k or (fIgnoreCase and k and Key.casefold() == k.casefold())):
+            return Index
+    return -1
+
+
+class KeyIndexTest(unittest.TestCase):
+    def CheckIndex(self, Section):
+        for k in Keys + ["", "missing"]:
+            for p in range(Section.GetSize() + 1):
+                for fIgnoreCase in (False, True):
+                    self.assertEqual(Section.GetExactKeyIndex(k, p, fIgnoreCase), FindKey(Section, k, p, fIgnoreCase))
+
+    def test_add_data(self):
+        Section = INFsection()
+        Section.SetName("Install")
+        Section.AddData("CopyFiles", "a")
+        self.CheckIndex(Section)
+        Section.AddData("copyfiles", "b")
+        Section.AddComment("comment")
+        Section.AddData("AddReg", "c")
+        self.CheckIndex(Section)
+        self.assertEqual(Section["AddReg"], "c")
+        self.assertEqual(Section["addreg"], "")
+        Section.SetIgnoreCase()
+        self.assertEqual(Section["addreg"], "c")
+
+    def test_insert_data(self):
+        Section = INFsection()
+        Section.SetName("Install")
+        Section.AddData("AddReg", "a")
+        self.CheckIndex(Section)
+        Section.AddDataP(0, "CopyFiles", "b")
+        self.CheckIndex(Section)
+        self.assertEqual(Section.GetExactKeyIndex("AddReg"), 1)
+        Section.AddDataP(1, "AddReg", "c")
+        self.CheckIndex(Section)
+        self.assertEqual(Section["AddReg"], "c")
+
+    def test_remove_data(self):
+        Section = INFsection()
+        Section.SetName("Install")
+        for k, v in (("CopyFiles", "a"), ("AddReg", "b"), ("CopyFiles", "c"), ("Needs", "d")):
+            Section.AddData(k, v)
+        self.CheckIndex(Section)
+        Section.RemoveKey("CopyFiles")
+        self.CheckIndex(Section)
+        self.assertEqual(Section["CopyFiles"], "c")
+        Section.RemoveValue("b")
+        self.CheckIndex(Section)
+        self.assertEqual(Section.GetExactKeyIndex("Needs"), 1)
+
+    def test_random_changes(self):
+        Random = random.Random(0)
+        Section = INFsection()
+        Section.SetName("Install")
+        for Change in range(300):
+            Action = Random.random()
+            k = Random.choice(Keys)
+            if Action < 0.4:
+                Section.AddData(k, str(Change))
+            elif Action < 0.6:
+                Section.AddDataP(Random.randint(0, Section.GetSize()), k, str(Change))
+            elif Action < 0.7:
+                Section.AddComment("c")
+            elif Action < 0.85:
+                Section.RemoveKey(k)
+            else:
+                Section.RemoveValue(str(Random.randrange(max(Change, 1))))
+            if Change % 10 == 0:
+                self.CheckIndex(Section)
+        self.CheckIndex(Section)
+
+
+if __name__ == "__main__":
+    unittest.main()
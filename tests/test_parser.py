@@ -0,0 +1,102 @@
+## @package test_parser
+#  Parser regression tests
+#
+#  data/parser_corpus.json was recorded with the original parser (before the fast-path tokenizer)
+#  from data/parser_corpus.inf: section names and types, rows, messages and saved text.
+#  All parse modes must give the same results.
+#
+import os
+import io
+import sys
+import json
+import unittest
+
+Directory = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(Directory, ".."))
+
+from wininfparser import WinINF, INFDiagnostics
+
+
+CorpusName = os.path.join(Directory, "data", "parser_corpus.inf")
+with open(os.path.join(Directory, "data", "parser_corpus.json"), encoding="utf-8") as f:
+    Expected = json.load(f)
+
+
+## Parses corpus file with collected messages
+#  @param Parse function (WinINF) -> None
+#  @return WinINF
+def ParseCorpus(Parse):
+    Inf = WinINF()
+    Inf.SetDiagnostics(INFDiagnostics(INFDiagnostics.collect))
+    Parse(Inf)
+    return Inf
+
+
+## Returns sections in the format of parser_corpus.json
+#  @param Inf (WinINF)
+#  @return list of dict
+def GetSections(Inf):
+    return [{"name": s.GetName(), "type": s.GetType(), "rows": [list(r) for r in s]} for s in Inf]
+
+
+## Returns saved text of the file
+#  @param Inf (WinINF)
+#  @return str
+def SavedText(Inf):
+    f = io.StringIO()
+    Inf.SaveTo(f)
+    return f.getvalue()
+
+
+class ParserTest(unittest.TestCase):
+    def CheckFile(self, Inf):
+        self.assertEqual(GetSections(Inf), Expected["sections"])
+        self.assertEqual(list(Inf.Sections()), Expected["names"])
+        self.assertEqual(SavedText(Inf), Expected["text"])
+        self.assertEqual([d.Message for d in Inf.GetDiagnostics()], Expected["messages"])
+
+    def test_parse_file(self):
+        self.CheckFile(ParseCorpus(lambda Inf: Inf.ParseFile(CorpusName, "utf-8")))
+
+    def test_parse_bytes(self):
+        with open(CorpusName, "rb") as f:
+            Data = f.read()
+        self.CheckFile(ParseCorpus(lambda Inf: Inf.ParseBytes(Data, "utf-8", CorpusName)))
+
+    def test_parse_lazy(self):
+        self.CheckFile(ParseCorpus(lambda Inf: Inf.ParseFile(CorpusName, "utf-8", fLazy=True)))
+
+    def test_parse_events(self):
+        Rows = []
+        Section = None
+        for Type, Line, a, b, c, Raw in WinINF.ParseEvents(CorpusName, "utf-8", INFDiagnostics(INFDiagnostics.silent)):
+            if Type == WinINF.event_section:
+                Section = a
+            elif Type == WinINF.event_row and Section:
+                Rows.append([Section, a.rstrip(), (b or "").lstrip()])
+
+        ExpectedRows = [[s["name"], k, v] for s in Expected["sections"] if s["name"] for k, v, c in s["rows"] if k]
+        self.assertEqual(Rows, ExpectedRows)
+
+    def test_keep_raw(self):
+        with open(CorpusName, encoding="utf-8") as f:
+            Text = f.read()
+
+        for fLazy in (False, True):
+            Inf = ParseCorpus(lambda Inf: Inf.ParseFile(CorpusName, "utf-8", fLazy=fLazy, fKeepRaw=True))
+            self.assertEqual(GetSections(Inf), Expected["sections"])
+            self.assertEqual(SavedText(Inf), Text)
+            self.assertEqual(Inf.GetText(), Text)
+
+    def test_keep_raw_prefix(self):
+        Text = "\n\n[Version]\nSignature=\"$Windows NT$\"\n"
+        for fLazy in (False, True):
+            Inf = WinINF()
+            Inf.SetDiagnostics(INFDiagnostics(INFDiagnostics.silent))
+            Inf.ParseBytes(Text.encode("utf-8"), "utf-8", fLazy=fLazy, fKeepRaw=True)
+            self.assertEqual(SavedText(Inf), Text)
+            self.assertEqual("".join(Inf.IterLines()), Inf.GetText())
+
+
+if __name__ == "__main__":
+    unittest.main()
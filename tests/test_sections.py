@@ -0,0 +1,80 @@
+## @package test_sections
+#  WinINF section list tests
+#
+#  After every change Sections must return names in the order of their first section in the file.
+#
+import os
+import sys
+import unittest
+
+Directory = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(Directory, ".."))
+
+from wininfparser import WinINF, INFsection, INFDiagnostics
+
+
+## Parses text
+#  @param Text (str)
+#  @return WinINF
+def Parse(Text):
+    Inf = WinINF()
+    Inf.SetDiagnostics(INFDiagnostics(INFDiagnostics.silent))
+    Inf.ParseBytes(Text.encode("utf-8"), "utf-8")
+    return Inf
+
+
+## Creates a new section with one row
+#  @param Name (str)
+#  @return INFsection
+def NewSection(Name):
+    Section = INFsection()
+    Section.SetName(Name)
+    Section.AddData("k", "v")
+    return Section
+
+
+class SectionsTest(unittest.TestCase):
+    def CheckOrder(self, Inf, Names):
+        FileOrder = list(dict.fromkeys(s.GetName() for s in Inf))
+        self.assertEqual(FileOrder, Names)
+        self.assertEqual(list(Inf.Sections()), Names)
+
+    def test_add_section(self):
+        Inf = Parse("[A]\nk=1\n[B]\nk=2\n")
+        Inf.AddSection(NewSection("Z"))
+        self.CheckOrder(Inf, ["A", "B", "Z"])
+
+    def test_add_section_before(self):
+        Inf = Parse("[A]\nk=1\n[B]\nk=2\n")
+        Inf.AddSectionBefore(NewSection("Z"), Inf.GetSection("A"))
+        self.CheckOrder(Inf, ["Z", "A", "B"])
+        Inf.AddSectionBefore(NewSection("B"), Inf.GetSection("A"))
+        self.CheckOrder(Inf, ["Z", "B", "A"])
+
+    def test_add_section_after(self):
+        Inf = Parse("[A]\nk=1\n[B]\nk=2\n")
+        Inf.AddSectionAfter(NewSection("Z"), Inf.GetSection("A"))
+        self.CheckOrder(Inf, ["A", "Z", "B"])
+        Inf.AddSectionAfter(NewSection("Y"), Inf.GetSection("B"))
+        self.CheckOrder(Inf, ["A", "Z", "B", "Y"])
+
+    def test_rename_section(self):
+        Inf = Parse("[A]\nk=1\n[B]\nk=2\n[C]\nk=3\n")
+        Inf.RenameSection(Inf.GetSection("C"), "Z")
+        self.CheckOrder(Inf, ["A", "B", "Z"])
+        Inf.RenameSection(Inf.GetSection("A"), "Y")
+        self.CheckOrder(Inf, ["Y", "B", "Z"])
+        Inf.RenameSection(Inf.GetSection("Z"), "Y")
+        self.CheckOrder(Inf, ["Y", "B"])
+        self.assertEqual(len(Inf.GetSections("Y")), 2)
+
+    def test_remove_section(self):
+        Inf = Parse("[A]\nk=1\n[B]\nk=2\n[A]\nk=3\n")
+        Inf.RemoveSection(Inf.GetSections("A")[0])
+        self.CheckOrder(Inf, ["B", "A"])
+        Inf.RemoveSection(Inf.GetSection("A"))
+        self.CheckOrder(Inf, ["B"])
+
+
+if __name__ == "__main__":
+    unittest.main()
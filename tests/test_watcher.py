@@ -0,0 +1,65 @@
+## @package test_watcher
+#  INFWatcher tests
+#
+import os
+import sys
+import json
+import tempfile
+import unittest
+
+Directory = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(Directory, ".."))
+
+from wininfparser import INFWatcher, INFChange, INFDiagnostics
+
+
+class WatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.Temp = tempfile.TemporaryDirectory()
+        self.Path = os.path.join(self.Temp.name, "inf")
+        os.mkdir(self.Path)
+        self.Manifest = os.path.join(self.Temp.name, "manifest.json")
+        self.Name = os.path.join(self.Path, "a.inf")
+        with open(self.Name, "w", encoding="utf-8") as f:
+            f.write("[Version]\nSignature=\"$Windows NT$\"\n")
+
+    def tearDown(self):
+        self.Temp.cleanup()
+
+    def Watcher(self):
+        Diagnostics = INFDiagnostics(INFDiagnostics.collect)
+        return INFWatcher(self.Path, self.Manifest, Diagnostics=Diagnostics), Diagnostics
+
+    def test_manifest(self):
+        Watcher, Diagnostics = self.Watcher()
+        self.assertEqual([(c.Type, c.Path) for c in Watcher.Refresh()], [(INFChange.added, self.Name)])
+
+        Watcher, Diagnostics = self.Watcher()
+        self.assertEqual(Watcher.Files(), [self.Name])
+        self.assertEqual(Watcher.Refresh(), [])
+        self.assertEqual(Diagnostics.Count(), 0)
+
+    def test_broken_manifest(self):
+        for Text in ("{\"version\": 1, \"files\": {", "[]", "{\"version\": 1}", "\xff"):
+            with open(self.Manifest, "w", encoding="latin-1") as f:
+                f.write(Text)
+
+            Watcher, Diagnostics = self.Watcher()
+            self.assertEqual(Watcher.Files(), [])
+            self.assertEqual(Diagnostics.Count(INFDiagnostics.invalid_format), 1)
+            self.assertEqual([c.Type for c in Watcher.Refresh()], [INFChange.added])
+
+            with open(self.Manifest, encoding="utf-8") as f:
+                self.assertEqual(json.load(f)["version"], INFWatcher.Version)
+
+    def test_manifest_version(self):
+        with open(self.Manifest, "w", encoding="utf-8") as f:
+            json.dump({"version": 0, "files": {}}, f)
+
+        Watcher, Diagnostics = self.Watcher()
+        self.assertEqual(Diagnostics.Count(INFDiagnostics.unsupported_version), 1)
+        self.assertEqual(Watcher.Files(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
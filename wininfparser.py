@@ -9,26 +9,79 @@
 import re
 import sys
 import os
+import io
+import glob
+import codecs
+import locale
+import functools
+import itertools
+import fnmatch
+import hashlib
+import pickle
+import json
+import time
+import sqlite3
+import array
+import mmap
+import struct
+import asyncio
+import concurrent.futures
+from bisect import bisect_left, bisect_right
 
 ## @mainpage
 #  Main Classes
 #  =================================================
 #  - \ref wininfparser.INFsection "INFsection"
 #  - \ref wininfparser.WinINF "WinINF"
+#  - \ref wininfparser.INFCache "INFCache"
+#  - \ref wininfparser.INFHardwareIndex "INFHardwareIndex"
+#  - \ref wininfparser.INFDiff "INFDiff"
+#  - \ref wininfparser.INFColumns "INFColumns"
+#  - \ref wininfparser.INFGraph "INFGraph"
+#  - \ref wininfparser.INFDatabase "INFDatabase"
+#  - \ref wininfparser.INFWatcher "INFWatcher"
+#  - \ref wininfparser.INFDiagnostics "INFDiagnostics"
 #
 #  List of basic functions for working with wininfparser
 #  =================================================
 #  Save, Open INF Files
 #  -------------------------------
 #  - \ref wininfparser.WinINF.ParseFile "WinINF.ParseFile"
+#  - \ref wininfparser.WinINF.ParseBytes "WinINF.ParseBytes"
+#  - \ref wininfparser.WinINF.ParseStream "WinINF.ParseStream"
+#  - \ref wininfparser.WinINF.ParseMany "WinINF.ParseMany"
+#  - \ref wininfparser.WinINF.ParseDirectory "WinINF.ParseDirectory"
+#  - \ref wininfparser.WinINF.ParseEvents "WinINF.ParseEvents"
+#  - \ref wininfparser.WinINF.ParseFileAsync "WinINF.ParseFileAsync"
+#  - \ref wininfparser.WinINF.ParseManyAsync "WinINF.ParseManyAsync"
+#  - \ref wininfparser.WinINF.SaveAsync "WinINF.SaveAsync"
 #  - \ref wininfparser.WinINF.Save "WinINF.Save"
+#  - \ref wininfparser.WinINF.SaveTo "WinINF.SaveTo"
+#  - \ref wininfparser.WinINF.IterLines "WinINF.IterLines"
+#  - \ref wininfparser.INFCache.ParseFile "INFCache.ParseFile"
+#  - \ref wininfparser.INFCache.Invalidate "INFCache.Invalidate"
 #
 #  WinINF Class
 #  =================================================
 #  - \ref wininfparser.WinINF.AddSection "WinINF.AddSection"
+#  - \ref wininfparser.WinINF.AddSectionBefore "WinINF.AddSectionBefore"
+#  - \ref wininfparser.WinINF.AddSectionAfter "WinINF.AddSectionAfter"
 #  - \ref wininfparser.WinINF.RemoveSection "WinINF.RemoveSection"
+#  - \ref wininfparser.WinINF.RenameSection "WinINF.RenameSection"
 #  - \ref wininfparser.WinINF.GetSection "WinINF.GetSection"
+#  - \ref wininfparser.WinINF.GetSections "WinINF.GetSections"
+#  - \ref wininfparser.WinINF.GetSectionAt "WinINF.GetSectionAt"
+#  - \ref wininfparser.WinINF.IndexOf "WinINF.IndexOf"
 #  - \ref wininfparser.WinINF.__getitem__ "WinINF.operator[]"
+#  - \ref wininfparser.WinINF.Resolve "WinINF.Resolve"
+#  - \ref wininfparser.WinINF.Query "WinINF.Query"
+#  - \ref wininfparser.WinINF.Diff "WinINF.Diff"
+#  - \ref wininfparser.WinINF.GetGraph "WinINF.GetGraph"
+#  - \ref wininfparser.WinINF.ApplyEdit "WinINF.ApplyEdit"
+#  - \ref wininfparser.WinINF.GetText "WinINF.GetText"
+#  - \ref wininfparser.WinINF.GetSectionAtLine "WinINF.GetSectionAtLine"
+#  - \ref wininfparser.WinINF.Freeze "WinINF.Freeze"
+#  - \ref wininfparser.WinINF.Snapshot "WinINF.Snapshot"
 #  - \ref wininfparser.WinINF.__next__ "WinINF.__next__"
 #  - \ref wininfparser.WinINF.__iter__ "WinINF.__iter__"
 #
@@ -36,6 +89,7 @@ import os
 #  =================================================
 #  - \ref wininfparser.INFsection.GetKeyIndex "INFsection.GetKeyIndex"
 #  - \ref wininfparser.INFsection.GetExactKeyIndex "INFsection.GetExactKeyIndex"
+#  - \ref wininfparser.INFsection.SetIgnoreCase "INFsection.SetIgnoreCase"
 #  - \ref wininfparser.INFsection.SetKeyAutoSize "INFsection.SetKeyAutoSize"
 #  - \ref wininfparser.INFsection.SetHeader "INFsection.SetHeader"
 #  - \ref wininfparser.INFsection.SetIndents "INFsection.SetIndents"
@@ -48,6 +102,8 @@ import os
 #  - \ref wininfparser.INFsection.FindValueIndex "INFsection.FindValueIndex"
 #  - \ref wininfparser.INFsection.FindValue "INFsection.FindValue"
 #  - \ref wininfparser.INFsection.GetValue "INFsection.GetValue"
+#  - \ref wininfparser.INFsection.GetFields "INFsection.GetFields"
+#  - \ref wininfparser.INFsection.IterFields "INFsection.IterFields"
 #  - \ref wininfparser.INFsection.CheckSection "INFsection.CheckSection"
 #  - \ref wininfparser.INFsection.GetType "INFsection.GetType"
 #  - \ref wininfparser.INFsection.SetIndent "INFsection.SetIndent"
@@ -60,12 +116,184 @@ import os
 #  - \ref wininfparser.INFsection.RemoveValue "INFsection.RemoveValue"
 #  - \ref wininfparser.INFsection.SearchKeyIter "INFsection.SearchKeyIter"
 #  - \ref wininfparser.INFsection.SearchValueIter "INFsection.SearchValueIter"
+#  - \ref wininfparser.INFsection.Query "INFsection.Query"
+#  - \ref wininfparser.INFsection.GetFingerprint "INFsection.GetFingerprint"
 #  - \ref wininfparser.INFsection.Info "INFsection.Info"
 #  - \ref wininfparser.INFsection.Save "INFsection.Save"
+#  - \ref wininfparser.INFsection.IterLines "INFsection.IterLines"
 #  - \ref wininfparser.INFsection.__getitem__ "INFsection.operator[]"
 #  - \ref wininfparser.INFsection.__next__ "INFsection.__next__"
 
 
+## Exception raised by INFDiagnostics in strict mode
+#
+class INFError(ValueError):
+    ## Default constructor
+    #  @param Diagnostic (INFDiagnostic)
+    def __init__(self,Diagnostic):
+        ValueError.__init__(self,Diagnostic.Message)
+        self.Diagnostic=Diagnostic
+
+
+## Single parser or file message, Message is formatted on first access
+#
+class INFDiagnostic:
+    __slots__=("Code","Level","File","Line","Args")
+
+    ## Default constructor
+    def __init__(self,Code,Level,File,Line,Args):
+        self.Code=Code
+        self.Level=Level
+        self.File=File
+        self.Line=Line
+        self.Args=Args
+
+    ## Returns formatted message
+    #  @return str
+    @property
+    def Message(self):
+        return INFDiagnostics.Formats[self.Code].format(os.path.basename(self.File or ""),self.Line,*self.Args)
+
+    def __repr__(self):
+        return "INFDiagnostic({0!r}, {1!r}, {2!r}, {3!r})".format(self.Code,self.File,self.Line,self.Message)
+
+
+## Collects parser and file messages
+#  mode      |  description                                              |
+#  --------- |---------------------------                                |
+#  verbose   |messages are printed (default)                             |
+#  collect   |messages are stored, see GetMessages                       |
+#  silent    |only counters are updated, messages are not formatted      |
+#  strict    |errors raise INFError, warnings are stored                 |
+#
+class INFDiagnostics:
+    verbose=1
+    collect=2
+    silent=3
+    strict=4
+
+    warning=1
+    error=2
+
+    empty_line="empty_line"
+    no_section="no_section"
+    unclosed_quote="unclosed_quote"
+    invalid_characters="invalid_characters"
+    empty_key="empty_key"
+    key_value_conversion="key_value_conversion"
+    named_header="named_header"
+    valid_section="valid_section"
+    empty_section="empty_section"
+    nothing_to_save="nothing_to_save"
+    frozen="frozen"
+    unknown_section="unknown_section"
+    unsupported_version="unsupported_version"
+    invalid_format="invalid_format"
+
+    ## Message levels
+    Levels={
+        empty_line:warning,
+        no_section:error,
+        unclosed_quote:warning,
+        invalid_characters:error,
+        empty_key:error,
+        key_value_conversion:warning,
+        named_header:error,
+        valid_section:error,
+        empty_section:error,
+        nothing_to_save:error,
+        frozen:error,
+        unknown_section:error,
+        unsupported_version:error,
+        invalid_format:error,
+    }
+
+    ## Message formats, {0} - file name, {1} - line number, {2}... - arguments
+    Formats={
+        empty_line:"Warning: File [{0}] Line {1} An empty line with no section! [skiped]",
+        no_section:"Error: File [{0}] Line {1} does not belong to any section. [skiped]",
+        unclosed_quote:"Warning: File [{0}] Line {1} Contains an unclosed quote.",
+        invalid_characters:"Error: File [{0}] Line {1} Contains invalid characters '[' or ']'. [skiped]",
+        empty_key:"Error: File [{0}] Line {1} Contains empty key. [skiped]",
+        key_value_conversion:"Warning the section [{2}]: will be converted to key value type!",
+        named_header:"Error: Header section must be unnamed!",
+        valid_section:"You can add only invalid sections!",
+        empty_section:"Error: Can't add emty section!",
+        nothing_to_save:"Error: empty inf file, nothing to save",
+        frozen:"Error: [{2}] is read-only, changes are not allowed!",
+        unknown_section:"Error: section [{2}] does not belong to the file [{0}]!",
+        unsupported_version:"Error: File [{0}] has unsupported {2} version {3}!",
+        invalid_format:"Error: File [{0}] is not a valid {2} file!",
+    }
+
+    ## Default constructor
+    #  @param Mode (int) INFDiagnostics.verbose, INFDiagnostics.collect, INFDiagnostics.silent or INFDiagnostics.strict
+    def __init__(self,Mode=1):
+        self.__Mode=Mode
+        self.__Items=[]
+        self.__Counters={}
+
+    ## Returns mode
+    #  @return int
+    def GetMode(self):
+        return self.__Mode
+
+    ## Adds message
+    #  @param Code (str) for example INFDiagnostics.empty_key
+    #  @param File (str)
+    #  @param Line (int)
+    #  @param Args message arguments
+    def Report(self,Code,File=None,Line=None,*Args):
+        self.__Counters[Code]=self.__Counters.get(Code,0)+1
+
+        if self.__Mode == INFDiagnostics.silent:
+            return
+
+        Diagnostic=INFDiagnostic(Code,INFDiagnostics.Levels[Code],File,Line,Args)
+        if self.__Mode == INFDiagnostics.verbose:
+            print(Diagnostic.Message)
+            return
+
+        if self.__Mode == INFDiagnostics.strict and Diagnostic.Level == INFDiagnostics.error:
+            raise INFError(Diagnostic)
+
+        self.__Items.append(Diagnostic)
+
+    ## Removes all messages and counters
+    def Clear(self):
+        self.__Items.clear()
+        self.__Counters.clear()
+
+    ## Returns stored messages
+    #  @return list of INFDiagnostic
+    def GetMessages(self):
+        return self.__Items
+
+    ## Returns number of messages for each code (counted in all modes)
+    #  @return dict
+    def Counters(self):
+        return dict(self.__Counters)
+
+    ## Returns number of messages
+    #  @param Code (str) if None, all messages are counted
+    #  @return int
+    def Count(self,Code=None):
+        if Code is None:
+            return sum(self.__Counters.values())
+        return self.__Counters.get(Code,0)
+
+    ## Lets go through the stored messages!
+    def __iter__(self):
+        return iter(self.__Items)
+
+    def __len__(self):
+        return len(self.__Items)
+
+
+## Shared collector for sections without own collector
+INFDiagnostics.Default=INFDiagnostics()
+
+
 ## Can return values, keys, and section comments of INF files.
 #  Allows you to navigate through the contents of a section. Able to add and remove values.
 #  Can search for keys and values within a section
@@ -80,6 +308,17 @@ class INFsection:
     single_line=2
     key_pair=3
 
+    match_substring=1
+    match_regex=2
+    match_glob=3
+
+    __slots__=("__AutoSizes","__kMinWS","__vMinWS","__cMinWS","__kAlignment","__kAlignmentSize",
+               "__Name","__NameComment","__Valid","__KeyList","__ValueList","__Comments",
+               "__NextSection","__PreviousSection","__Indent","__EmptyCount","__CurrentIndex","__Type",
+               "__Frozen",
+               "__IgnoreCase","__KeyIndex","__KeyIndexCI","__KeyIndexSize","__Loader","__Revision",
+               "__Diagnostics","__Raw","__RawRevision","__Fingerprint","__Fields","__Listener")
+
     ## Default constructor
     def __init__(self,AutodetectSizes=False):
         self.__AutoSizes=AutodetectSizes
@@ -107,26 +346,155 @@ class INFsection:
         self.__EmptyCount = 0
         self.__CurrentIndex = None
         self.__Type=None
-        self.__SearchKey=None
-        self.__SearchKeyIndex=0
-        self.__SearchValue = None
-        self.__SearchValueIndex = 0
-        self.__ItHelpFlag=False
+        self.__Frozen=False
+        self.__IgnoreCase=False
+        self.__KeyIndex=None
+        self.__KeyIndexCI=None
+        self.__KeyIndexSize=0
+        self.__Loader=None
+        self.__Revision=0
+        self.__Diagnostics=None
+        self.__Raw=None
+        self.__RawRevision=0
+        self.__Fingerprint=None
+        self.__Fields=None
+        self.__Listener=None
+
+    ## Pickle support, links to neighbour sections and read-only state are restored by WinINF
+    #  @return dict
+    def __getstate__(self):
+        self.Load()
+        State={n:getattr(self,n) for n in INFsection.SlotNames}
+        State['_INFsection__NextSection']=None
+        State['_INFsection__PreviousSection']=None
+        State['_INFsection__KeyIndex']=None
+        State['_INFsection__KeyIndexCI']=None
+        State['_INFsection__KeyIndexSize']=0
+        State['_INFsection__Fields']=None
+        State['_INFsection__Frozen']=False
+        State['_INFsection__Listener']=None
+        return State
+
+    ## Pickle support
+    #  @param State (dict)
+    def __setstate__(self,State):
+        for n,v in State.items():
+            setattr(self,n,v)
+
+    ## Returns approximate memory size of the section in bytes.
+    #  Objects from Seen are not counted, strings shared between sections are counted once for the same Seen
+    #  @param Seen (set) ids of already counted objects
+    #  @return int
+    def GetMemoryUsage(self,Seen=None):
+        if Seen is None:
+            Seen=set()
+
+        Size=0
+        Objects=[self,self.__KeyList,self.__ValueList,self.__Comments,self.__Name,self.__NameComment,self.__KeyIndex,self.__KeyIndexCI,self.__Raw,self.__Fields]
+        for o in itertools.chain(Objects,self.__KeyList,self.__ValueList,self.__Comments):
+            if o is not None and id(o) not in Seen:
+                Seen.add(id(o))
+                Size+=sys.getsizeof(o)
+
+        for Index in (self.__KeyIndex,self.__KeyIndexCI):
+            if Index is not None:
+                for Positions in Index.values():
+                    Size+=sys.getsizeof(Positions)
+        return Size
+
+    ## Sets diagnostics collector for section messages, if None the default collector is used (prints messages)
+    #  @param Diagnostics (INFDiagnostics)
+    def SetDiagnostics(self,Diagnostics):
+        self.__Diagnostics=Diagnostics
+
+    ## Function required for messages
+    #  @return INFDiagnostics
+    def __GetDiagnostics(self):
+        if self.__Diagnostics is None:
+            return INFDiagnostics.Default
+        return self.__Diagnostics
+
+    ## Makes section read-only: content is loaded and key index is built, all changes are rejected.
+    #  A frozen section can be read from many threads without locking: content is not changed,
+    #  caches of GetFields and GetFingerprint are still filled on first use, each entry is stored
+    #  with one assignment, so under the GIL readers see either no entry or a complete one
+    def Freeze(self):
+        self.Load()
+        self.__KeyIndexUpdate()
+        if self.__Fields is None:
+            self.__Fields={}
+        self.__Frozen=True
+
+    ## Checks if section is read-only
+    #  @return bool
+    def IsFrozen(self):
+        return self.__Frozen
+
+    ## Function required for read-only sections
+    def __ReportFrozen(self):
+        self.__GetDiagnostics().Report(INFDiagnostics.frozen,None,None,self.__Name)
+
+    ## Returns section revision, it is increased on every change of the section
+    #  @return int
+    def GetRevision(self):
+        return self.__Revision
+
+    ## Sets original section text, it is saved instead of the section content while the section is not modified
+    #  @param Raw (str) if None, the section is always formatted
+    def SetRaw(self,Raw):
+        if self.__Frozen: return self.__ReportFrozen()
+        self.__Raw=Raw
+        self.__RawRevision=self.__Revision
+        if self.__Listener is not None:
+            self.__Notify()
+
+    ## Returns original section text or None
+    #  @return str
+    def GetRaw(self):
+        return self.__Raw
+
+    ## Checks if section was modified after SetRaw (always True for sections without original text)
+    #  @return bool
+    def IsModified(self):
+        return self.__Raw is None or self.__RawRevision != self.__Revision
+
+    ## Returns fingerprint of the section content: keys and values without white spaces and comments.
+    #  Sections with equal fingerprints have the same data, the fingerprint is computed once for each revision
+    #  @return bytes
+    def GetFingerprint(self):
+        self.Load()
+        Fingerprint=self.__Fingerprint
+        if Fingerprint is not None and Fingerprint[0] == self.__Revision:
+            return Fingerprint[1]
+
+        Hash=hashlib.blake2b(digest_size=16)
+        for k,v,c in self:
+            if k:
+                Hash.update("{0}\x1f{1}\x1e".format(k.strip().casefold(),v.strip() if v else "").encode("utf-8","surrogatepass"))
+
+        self.__Fingerprint=(self.__Revision,Hash.digest())
+        return self.__Fingerprint[1]
 
     ## Returns section size
     def GetSize(self):
         return len(self.__KeyList)
 
     ## Lets go through the section content!
-    #  @return INFsection
+    #  Every call returns a new independent iterator, so nested loops and threads do not affect each other
+    #  @return iterator of (key, value, comment)
     def __iter__(self):
-        if not self.__ItHelpFlag:
-            self.__CurrentIndex=None
-            self.__SearchKey = None
-            self.__SearchValue = None
-        else:
-            self.__ItHelpFlag=False
-        return self
+        CurrentIndex=0
+        while CurrentIndex < len(self.__KeyList):
+            yield self.__Row(CurrentIndex)
+            CurrentIndex+=1
+
+    ## Function required for iteration
+    #  @param Index (int)
+    #  @return k,v,c
+    def __Row(self,Index):
+        if len(self.__ValueList):
+            return self.__KeyList[Index],self.__ValueList[Index],self.__Comments[Index]
+        return self.__KeyList[Index],"",self.__Comments[Index]
 
     ## automatic alignment of keys according to the maximum length and setting the indent after the key and before the value
     #  @param keyWhitespaces (int) number of whitespaces after key
@@ -134,6 +502,8 @@ class INFsection:
     #  @param commentWhitespaces (int) number of whitespaces before comment
     #  @param fKeyAlignment (bool)
     def SetKeyAutoSize(self,fKeyAlignment:bool = True,keyWhitespaces:int = None,valueWhitespaces:int = None,commentWhitespaces:int = None):
+        if self.__Frozen: return self.__ReportFrozen()
+        self.__Modified()
         if self.__kAlignment != fKeyAlignment:
             self.__kAlignment=fKeyAlignment
             self.__kAlignmentSize=0
@@ -152,13 +522,16 @@ class INFsection:
     ## Sets the header for the section
     #  @param h (str)
     def SetHeader(self,h:str):
+        if self.__Frozen: return self.__ReportFrozen()
         if self.__Name:
-            print('Error: Header section must be unnamed!')
+            self.__GetDiagnostics().Report(INFDiagnostics.named_header,None,None,self.__Name)
             return
 
+        self.__Modified()
         self.__KeyList.clear()
         self.__ValueList.clear()
         self.__Comments.clear()
+        self.__KeyIndex=None
         self.__Indent=0
         self.__EmptyCount = 0
 
@@ -172,6 +545,8 @@ class INFsection:
     #  @param valueWhitespaces (int) number of whitespaces before value
     #  @param commentWhitespaces (int) number of whitespaces before comment
     def SetIndents(self,keyWhitespaces:int = None,valueWhitespaces:int = None,commentWhitespaces:int = None):
+        if self.__Frozen: return self.__ReportFrozen()
+        self.__Modified()
         if keyWhitespaces is not None:
             self.__kMinWS=keyWhitespaces
         if valueWhitespaces is not None:
@@ -179,7 +554,7 @@ class INFsection:
         if commentWhitespaces is not None:
             self.__cMinWS=commentWhitespaces
 
-    ## Lets go through the section content!
+    ## Returns next row of the section (cursor is stored in the section, use iter() for independent iteration)
     #  returns k - key
     #  returns v - value
     #  returns c - comment
@@ -189,61 +564,28 @@ class INFsection:
     #  \endcode
     #  @return str,str,str
     def __next__(self):
-        if self.__SearchKey is not None:
-            self.__SearchKeyIndex=self.GetKeyIndex(self.__SearchKey,self.__SearchKeyIndex)
-            if self.__SearchKeyIndex < 0:
-                self.__SearchKey = None
-                self.__SearchKeyIndex = 0
-                raise StopIteration
-            else:
-                Index=self.__SearchKeyIndex
-                self.__SearchKeyIndex+=1
-                if len(self.__ValueList):
-                    return self.__KeyList[Index], self.__ValueList[Index], self.__Comments[Index]
-                else:
-                    return self.__KeyList[Index], "", self.__Comments[Index]
-
-
-        if self.__SearchValue is not None:
-            self.__SearchValueIndex=self.FindValueIndex(self.__SearchValue,self.__SearchValueIndex)
-            if self.__SearchValueIndex < 0:
-                self.__SearchValue = None
-                self.__SearchValueIndex = 0
-                raise StopIteration
-            else:
-                Index=self.__SearchValueIndex
-                self.__SearchValueIndex+=1
-                return self.__KeyList[Index], self.__ValueList[Index], self.__Comments[Index]
-
-        if self.__CurrentIndex is not None:
-            if len(self.__KeyList) >  self.__CurrentIndex+1:
-                self.__CurrentIndex+=1
-                if len(self.__ValueList):
-                    return self.__KeyList[self.__CurrentIndex],self.__ValueList[self.__CurrentIndex],self.__Comments[self.__CurrentIndex]
-                else:
-                    return self.__KeyList[self.__CurrentIndex],"",self.__Comments[self.__CurrentIndex]
-            else:
-                self.__CurrentIndex=None
-                raise StopIteration
+        if self.__CurrentIndex is None:
+            self.__CurrentIndex=0
         else:
-            if not len(self.__KeyList):
-                raise StopIteration
-            else:
-                self.__CurrentIndex = 0
-                if len(self.__ValueList):
-                    return self.__KeyList[self.__CurrentIndex],self.__ValueList[self.__CurrentIndex],self.__Comments[self.__CurrentIndex]
-                else:
-                    return self.__KeyList[self.__CurrentIndex],"",self.__Comments[self.__CurrentIndex]
+            self.__CurrentIndex+=1
+
+        if self.__CurrentIndex >= len(self.__KeyList):
+            self.__CurrentIndex=None
+            raise StopIteration
+        return self.__Row(self.__CurrentIndex)
 
 
     ## Returns next Section
     #  @return INFsection
     def Next(self):
+        if self.__NextSection is not None:
+            self.__NextSection.Load()
         return self.__NextSection
 
     ## Sets next Section
     #  @param n (INFsection) must be Invalid
     def SetNext(self, n):
+        if self.__Frozen: return self.__ReportFrozen()
         if n is not None:
             n.__PreviousSection=self
         self.__NextSection=n
@@ -251,6 +593,7 @@ class INFsection:
     ## Sets previous Section
     #  @param p (INFsection) must be Invalid
     def SetPrevious(self, p):
+        if self.__Frozen: return self.__ReportFrozen()
         if p is not None:
             p.__NextSection=self
         self.__PreviousSection=p
@@ -266,10 +609,51 @@ class INFsection:
     ## Returns previous Section
     #  @return INFsection
     def Previous(self):
+        if self.__PreviousSection is not None:
+            self.__PreviousSection.Load()
         return self.__PreviousSection
 
+    ## Sets function that parses section content on first access (used by lazy parsing)
+    #  @param Loader callable, gets section as argument
+    def SetLoader(self,Loader):
+        if self.__Frozen: return self.__ReportFrozen()
+        self.__Loader=Loader
+
+    ## Parses section content if the section was created by lazy parsing (see WinINF.ParseFile)
+    def Load(self):
+        if self.__Loader is not None:
+            Loader=self.__Loader
+            self.__Loader=None
+            Loader(self)
+
+    ## Checks if section content is parsed
+    #  @return bool
+    def IsLoaded(self):
+        return self.__Loader is None
+
+    ## Sets function that is called once after the next change of the section text (used by WinINF line index).
+    #  The function is removed before the call, so it is set again to get the following change
+    #  @param Listener callable, gets section as argument, None - no function
+    def SetListener(self,Listener):
+        self.__Listener=Listener
+
+    ## Function required for changes
+    #  increases revision and calls the listener (see SetListener)
+    def __Modified(self):
+        self.__Revision+=1
+        if self.__Listener is not None:
+            self.__Notify()
+
+    ## Function required for changes
+    #  calls the listener once
+    def __Notify(self):
+        Listener=self.__Listener
+        self.__Listener=None
+        Listener(self)
+
     ## Sets sction type must be INFsection.comment or INFsection.single_line or INFsection.key_pair
     def SetType(self,t):
+        if self.__Frozen: return self.__ReportFrozen()
         self.__Type=t
 
     ## Returns Section type
@@ -280,6 +664,8 @@ class INFsection:
     ## Sets indent after section
     #  @param i (int)
     def SetIndent(self,i: int):
+        if self.__Frozen: return self.__ReportFrozen()
+        self.__Modified()
         self.__Indent=i
 
     ## returns indent after section
@@ -290,11 +676,15 @@ class INFsection:
     ## Sets section name
     #  @param NewName (str)
     def SetName(self,NewName):
-        self.__Name=NewName
+        if self.__Frozen: return self.__ReportFrozen()
+        self.__Modified()
+        self.__Name=INFsection.__Intern(NewName)
 
     ## Sets comment to section name
     #  @param NewNameComment (str)
     def SetNameComment(self,NewNameComment):
+        if self.__Frozen: return self.__ReportFrozen()
+        self.__Modified()
         self.__NameComment=NewNameComment
 
     ## returns section name
@@ -335,6 +725,14 @@ class INFsection:
 
         self.__Indent = 0
 
+    ## Function required for AddData, AddDataP and SetName
+    #  keys and section names repeat across sections and files, so they are stored once
+    #  @param Text (str)
+    #  @return str
+    @staticmethod
+    def __Intern(Text):
+        return sys.intern(Text) if type(Text) is str else Text
+
     def __kUpdateASize(self,k):
         if not k:
             return
@@ -380,6 +778,8 @@ class INFsection:
     #  @param v value (str)
     #  @param c comment (str)
     def AddData(self,k,v=None,c=None,fraw=False):
+        if self.__Frozen: return self.__ReportFrozen()
+        self.__Modified()
         if not self.__Valid:
             self.AddEmptyStrings()
 
@@ -388,7 +788,7 @@ class INFsection:
         elif self.__kAlignment:
             self.__kUpdateASize(k)
 
-        if k: k=k.rstrip()
+        if k: k=INFsection.__Intern(k.rstrip())
         self.__KeyList.append(k)
 
         if v is not None:
@@ -397,7 +797,7 @@ class INFsection:
                 self.__ValueList=['' for i in range(self.__EmptyCount)]
                 self.__EmptyCount=0
             if len(self.__KeyList) - 1 != len(self.__ValueList):
-                print("Warning the section [{}]: will be converted to key value type!".format(self.__Name))
+                self.__GetDiagnostics().Report(INFDiagnostics.key_value_conversion,None,None,self.__Name)
                 self.__ValueList += ['' for i in range(len(self.__KeyList) - 1 - len(self.__ValueList))]
             self.__ValueList.append(v)
 
@@ -419,6 +819,8 @@ class INFsection:
     ## Adds comment to the end of the section
     #  @param c (str)
     def AddComment(self,c=None,fraw=False):
+        if self.__Frozen: return self.__ReportFrozen()
+        self.__Modified()
         if not len(self.__ValueList):
             self.__EmptyCount+=1
 
@@ -446,10 +848,12 @@ class INFsection:
     #  @param v value (str)
     #  @param c comment (str)
     def AddDataP(self,pos: int,k,v=None,c=None,fraw=False):
+        if self.__Frozen: return self.__ReportFrozen()
         if len(self.__KeyList) < pos or pos < 0:
             self.AddData(k,v,c)
             return
         else:
+            self.__Modified()
             if not self.__Valid:
                 self.AddEmptyStrings()
 
@@ -458,9 +862,10 @@ class INFsection:
             elif self.__kAlignment:
                 self.__kUpdateASize(k)
 
-            if k: k = k.rstrip()
+            if k: k = INFsection.__Intern(k.rstrip())
 
             self.__KeyList.insert(pos,k)
+            self.__KeyIndex=None
 
             if v is not None:
                 v = v.lstrip()
@@ -487,10 +892,13 @@ class INFsection:
     ## Removes first matched key of the section
     #  @param k key (str)
     def RemoveKey(self, k):
+        if self.__Frozen: return self.__ReportFrozen()
         try:
             CurrentIndex=self.__KeyList.index(k)
 
             self.__KeyList.pop(CurrentIndex)
+            self.__KeyIndex=None
+            self.__Modified()
             self.__Comments.pop(CurrentIndex)
             if len(self.__ValueList):
                 self.__ValueList.pop(CurrentIndex)
@@ -500,10 +908,13 @@ class INFsection:
     ## Removes first matched value of the section
     #  @param v value (str)
     def RemoveValue(self, v):
+        if self.__Frozen: return self.__ReportFrozen()
         try:
             CurrentIndex = self.__ValueList.index(v)
 
             self.__KeyList.pop(CurrentIndex)
+            self.__KeyIndex=None
+            self.__Modified()
             self.__ValueList.pop(CurrentIndex)
             self.__Comments.pop(CurrentIndex)
         except:
@@ -512,10 +923,12 @@ class INFsection:
     ## Removes first matched comment of the section
     #  @param c comment (str)
     def RemoveComment(self, c):
+        if self.__Frozen: return self.__ReportFrozen()
         try:
             CurrentIndex = self.__Comments.index(c)
 
             self.__Comments[CurrentIndex]=""
+            self.__Modified()
         except:
             pass
 
@@ -540,31 +953,70 @@ class INFsection:
     #  @param k (str)
     #  @param v (str)
     def __setitem__(self,k,v):
+        if self.__Frozen: return self.__ReportFrozen()
         i=self.GetExactKeyIndex(k)
         if i < 0:
             self.AddData(k,v,"")
         else:
             if len(self.__ValueList):
                 self.__ValueList[i]=v
+                self.__Modified()
 
     ## Searches key where (k in key) from position p
     #  @param k (str)
     #  @param p (int)
     #  @return int
     def GetKeyIndex(self,k,p=0):
-        for CurrentIndex, key in enumerate(self.__KeyList):
-            if CurrentIndex>=p and k in key:
+        for CurrentIndex in range(max(p,0),len(self.__KeyList)):
+            if k in self.__KeyList[CurrentIndex]:
                 return CurrentIndex
         return -1
 
+    ## Sets default key matching mode for GetExactKeyIndex, operator[] and operator[]=
+    #  INF key names are case-insensitive, so this can be enabled for lookups like Strings tokens
+    #  @param fIgnoreCase (bool)
+    def SetIgnoreCase(self,fIgnoreCase:bool = True):
+        if self.__Frozen: return self.__ReportFrozen()
+        self.__IgnoreCase=fIgnoreCase
+
+    ## Function required for key lookups
+    #  brings key->positions index up to date, appended keys are indexed incrementally,
+    #  after insert or remove the index is rebuilt on the next lookup
+    def __KeyIndexUpdate(self):
+        if self.__KeyIndex is None:
+            self.__KeyIndex={}
+            self.__KeyIndexCI={}
+            self.__KeyIndexSize=0
+
+        for CurrentIndex in range(self.__KeyIndexSize,len(self.__KeyList)):
+            key=self.__KeyList[CurrentIndex]
+            self.__KeyIndex.setdefault(key,[]).append(CurrentIndex)
+            if key:
+                self.__KeyIndexCI.setdefault(key.casefold(),[]).append(CurrentIndex)
+
+        self.__KeyIndexSize=len(self.__KeyList)
+
     ## Looks for a key where k exactly matches the key from position p
     #  @param k (str)
     #  @param p (int)
+    #  @param fIgnoreCase (bool) if None section default is used (see SetIgnoreCase)
     #  @return int
-    def GetExactKeyIndex(self,k,p=0):
-        for CurrentIndex, key in enumerate(self.__KeyList):
-            if CurrentIndex>=p and k == key:
-                return CurrentIndex
+    def GetExactKeyIndex(self,k,p=0,fIgnoreCase=None):
+        if fIgnoreCase is None:
+            fIgnoreCase=self.__IgnoreCase
+
+        self.__KeyIndexUpdate()
+        if fIgnoreCase and k:
+            Positions=self.__KeyIndexCI.get(k.casefold())
+        else:
+            Positions=self.__KeyIndex.get(k)
+
+        if not Positions:
+            return -1
+
+        i=bisect_left(Positions,p)
+        if i < len(Positions):
+            return Positions[i]
         return -1
 
     ## Searches key where (k in key) from position p
@@ -573,10 +1025,10 @@ class INFsection:
     #  @param p (int)
     #  @return k,v,c (key,value,comment)
     def SearchKeyIter(self, k, p=0):
-        self.__ItHelpFlag = True
-        self.__SearchKey=k
-        self.__SearchKeyIndex=p
-        return self
+        Index=self.GetKeyIndex(k,p)
+        while Index >= 0:
+            yield self.__Row(Index)
+            Index=self.GetKeyIndex(k,Index+1)
 
     ## Searches value where (v in value) from position p
     #  this function used to iterate over section and search
@@ -584,10 +1036,10 @@ class INFsection:
     #  @param p (int)
     #  @return str (key,value,comment)
     def SearchValueIter(self, v, p=0):
-        self.__ItHelpFlag = True
-        self.__SearchValue=v
-        self.__SearchValueIndex=p
-        return self
+        Index=self.FindValueIndex(v,p)
+        while Index >= 0:
+            yield self.__Row(Index)
+            Index=self.FindValueIndex(v,Index+1)
 
     ## Searches key where (k in key) from position p and return its value
     #  @param k (str)
@@ -607,18 +1059,18 @@ class INFsection:
     #  @param p (int)
     #  @return str (full key string)
     def FindKey(self,k,p=0):
-        for CurrentIndex, key in enumerate(self.__KeyList):
-            if CurrentIndex>=p and k in key:
-                return key
-        return ""
+        CurrentIndex=self.GetKeyIndex(k,p)
+        if CurrentIndex < 0:
+            return ""
+        return self.__KeyList[CurrentIndex]
 
     ## Searches value where (v in value) from position p
     #  @param v (str)
     #  @param p (int)
     #  @return int
     def FindValueIndex(self,v,p=0):
-        for CurrentIndex, val in enumerate(self.__ValueList):
-            if CurrentIndex>=p and v in val:
+        for CurrentIndex in range(max(p,0),len(self.__ValueList)):
+            if v in self.__ValueList[CurrentIndex]:
                 return CurrentIndex
         return -1
 
@@ -627,10 +1079,52 @@ class INFsection:
     #  @param p (int)
     #  @return str (full value string)
     def FindValue(self,v,p=0):
-        for CurrentIndex, val in enumerate(self.__ValueList):
-            if CurrentIndex>=p and v in val:
-                return val
-        return ""
+        CurrentIndex=self.FindValueIndex(v,p)
+        if CurrentIndex < 0:
+            return ""
+        return self.__ValueList[CurrentIndex]
+
+    ## Returns function that checks if a string matches the pattern
+    #  @param Pattern (str)
+    #  @param Mode (int) INFsection.match_substring, INFsection.match_regex or INFsection.match_glob
+    #  @param fIgnoreCase (bool)
+    #  @return callable
+    @staticmethod
+    def GetMatcher(Pattern,Mode=1,fIgnoreCase=False):
+        if Mode == INFsection.match_substring:
+            if fIgnoreCase:
+                Pattern=Pattern.casefold()
+                return lambda s: Pattern in s.casefold()
+            return lambda s: Pattern in s
+
+        Flags=re.IGNORECASE if fIgnoreCase else 0
+        if Mode == INFsection.match_glob:
+            return re.compile(fnmatch.translate(Pattern),Flags).match
+        if Mode == INFsection.match_regex:
+            return re.compile(Pattern,Flags).search
+        raise ValueError("Unknown match mode {0}".format(Mode))
+
+    ## Searches keys, values or comments matching the pattern
+    #  \code{.py}
+    #  for Index,k,v,c in s.Query("PCI\\VEN_8086&DEV_35??*", INFsection.match_glob, fKeys=False):
+    #      print(Index, k, v)
+    #  \endcode
+    #  @param Pattern (str) or function that gets a string and returns bool
+    #  @param Mode (int) INFsection.match_substring, INFsection.match_regex or INFsection.match_glob
+    #  @param fKeys (bool) search in keys
+    #  @param fValues (bool) search in values
+    #  @param fComments (bool) search in comments
+    #  @param fIgnoreCase (bool)
+    #  @return generator of (index, key, value, comment)
+    def Query(self,Pattern,Mode=1,fKeys=True,fValues=True,fComments=False,fIgnoreCase=False):
+        Match=Pattern if callable(Pattern) else INFsection.GetMatcher(Pattern,Mode,fIgnoreCase)
+        fValues=fValues and len(self.__ValueList) > 0
+
+        for CurrentIndex, key in enumerate(self.__KeyList):
+            val=self.__ValueList[CurrentIndex] if len(self.__ValueList) else ""
+            com=self.__Comments[CurrentIndex]
+            if (fKeys and key and Match(key)) or (fValues and val and Match(val)) or (fComments and com and Match(com)):
+                yield CurrentIndex,key,val,com
 
     ## Returns value with selected index
     #  @param Index (int)
@@ -638,6 +1132,80 @@ class INFsection:
     def GetValue(self,Index):
         return self.__ValueList[Index]
 
+    ## Returns comma separated fields of the row value, for rows without value (and single line sections) the key is split.
+    #  Commas inside quotes are not separators, white spaces around fields and quotes are removed.
+    #  Fields are cached while the row is not changed
+    #  \code{.py}
+    #  Section = InfFile['Intel.Mfg']
+    #  print(Section.GetFields(2))   # ('i830M', 'PCI\\VEN_8086&DEV_3577&SUBSYS_00C81028')
+    #  \endcode
+    #  @param Index (int) row index
+    #  @return tuple of str, empty tuple for comment rows
+    def GetFields(self,Index):
+        if Index < 0:
+            Index+=len(self.__KeyList)
+
+        if not self.__KeyList[Index]:
+            return ()
+
+        Source=self.__ValueList[Index] if len(self.__ValueList) else ''
+        if not Source:
+            Source=self.__KeyList[Index] or ''
+
+        if self.__Fields is None:
+            self.__Fields={}
+
+        Cached=self.__Fields.get(Index)
+        if Cached is not None and Cached[0] == Source:
+            return Cached[1]
+
+        Fields=INFsection.SplitFields(Source)
+        self.__Fields[Index]=(Source,Fields)
+        return Fields
+
+    ## Lets go through the fields of all rows, comment rows are skipped (see GetFields)
+    #  @return iterator of (key, tuple of fields)
+    def IterFields(self):
+        for Index in range(len(self.__KeyList)):
+            k=self.__KeyList[Index]
+            if k:
+                yield k,self.GetFields(Index)
+
+    ## Splits comma separated text to fields, commas inside quotes are not separators.
+    #  White spaces around fields are removed, quoted fields are unquoted ("" is replaced with ")
+    #  @param Text (str)
+    #  @return tuple of str
+    @staticmethod
+    def SplitFields(Text):
+        if '"' not in Text:
+            return tuple(Field.strip() for Field in Text.split(','))
+
+        Fields=[]
+        Pending=None
+        for Part in Text.split(','):
+            if Pending is not None:
+                Part=Pending+','+Part
+            if Part.count('"') % 2:
+                Pending=Part
+                continue
+
+            Pending=None
+            Fields.append(INFsection.__Unquote(Part))
+
+        if Pending is not None:
+            Fields.append(INFsection.__Unquote(Pending))
+        return tuple(Fields)
+
+    ## Function required for SplitFields
+    #  @param Field (str)
+    #  @return str
+    @staticmethod
+    def __Unquote(Field):
+        Field=Field.strip()
+        if len(Field) > 1 and Field[0] == '"' and Field[-1] == '"':
+            return Field[1:-1].replace('""','"')
+        return Field
+
     ## Prints all section content
     def Info(self):
         if self.__Name != "":
@@ -678,12 +1246,21 @@ class INFsection:
         for i in range(self.__Indent):
             print("")
 
-    ## Saves all section content to the string
-    #  @return str
-    def Save(self):
-        Returner=""
+    ## Returns section content line by line (each line ends with "\n")
+    #  Lines are produced on demand, so memory stays flat for large sections.
+    #  Original text is returned for sections that were not modified (see SetRaw),
+    #  line break is added to the last line of the text if another section follows
+    #  @return generator of str
+    def IterLines(self):
+        if not self.IsModified():
+            if self.__NextSection is None or not self.__Raw or self.__Raw.endswith("\n"):
+                yield from io.StringIO(self.__Raw)
+            else:
+                yield from io.StringIO(self.__Raw+"\n")
+            return
+
         if self.__Name != "":
-            Returner="[{0}]{1}\n".format(self.__Name,self.__NameComment)
+            yield "[{0}]{1}\n".format(self.__Name,self.__NameComment)
 
         if not self.__kAlignment:
             self.__kAlignmentSize=0
@@ -700,9 +1277,9 @@ class INFsection:
                     c=''
 
                 if key:
-                    Returner += (key.ljust(self.__kAlignmentSize) + "=".rjust(rjlen).ljust(ljlen) + self.__ValueList[CurrentIndex] + c + "\n")
+                    yield key.ljust(self.__kAlignmentSize) + "=".rjust(rjlen).ljust(ljlen) + self.__ValueList[CurrentIndex] + c + "\n"
                 else:
-                    Returner += (c + "\n")
+                    yield c + "\n"
         else:
             for CurrentIndex, key in enumerate(self.__KeyList):
                 if self.__Comments[CurrentIndex]:
@@ -713,38 +1290,140 @@ class INFsection:
                     c=''
 
                 if key:
-                    Returner += (key.ljust(self.__kAlignmentSize) + c + "\n")
+                    yield key.ljust(self.__kAlignmentSize) + c + "\n"
                 else:
-                    Returner += (c + "\n")
+                    yield c + "\n"
 
         for i in range(self.__Indent):
-            Returner+="\n"
+            yield "\n"
+
+    ## Saves all section content to the string
+    #  @return str
+    def Save(self):
+        return "".join(self.IterLines())
 
-        return Returner
 
 
+## Attribute names used by pickle support
+INFsection.SlotNames=tuple("_INFsection"+n for n in INFsection.__slots__)
+
 
 ## Class WinINF - Can open INF files, allows you to get a section by its name,
 #  can save INF files, and allows you to walk through all sections of a file
 #
 class WinINF:
+    event_section=1
+    event_row=2
+    event_comment=3
+    event_blank=4
+    event_error=5
+
+    #__SepRE=re.compile('[^";=]*("|;|=)?')
+    __SepRE = re.compile('[^][";=]*(\\]|\\[|"|;|=)?')
+    __KeyRE = re.compile('[^"]*(")')
+    #__ValueRE = re.compile('[^";=]*("|;)?')
+    __ValueRE = re.compile('[^";=]*("|;)?')
+    __FastSepRE = re.compile('[][;=]')
+
+    __EmptyRE = re.compile('\\s*$')
+    __SectRE = re.compile(" *\\[([^]]*)\\](\\s*;.*)?")
+    __LazySectRE = re.compile("^ *\\[[^]\\n]*\\]",re.M)
+    __TokenRE = re.compile("%([^%]*)%")
+
     ## Default constructor
     def __init__(self):
         self.__FileName=""
         self.__Head=None
         self.__Tail=None
         self.__Current=None
-        self.__ItemCount=0
+        self.__Order=[]
+        self.__Positions={}
         self.__SectionsDict={}
+        self.__NameIndex={}
         self.__FileCodec = None
+        self.__Revision=0
+        self.__StringsCache={}
+        self.__Diagnostics=INFDiagnostics()
+        self.__KeepRaw=False
+        self.__Frozen=False
+        self.__Prefix=""
+        self.__LineIndex=None
+        self.__LineChanges=[]
+        self.__Graph=None
+        self.__NamesSorted=True
+
+    ## Pickle support, sections are stored as a list instead of the linked list
+    #  @return dict
+    def __getstate__(self):
+        State=self.__dict__.copy()
+        State['_WinINF__Head']=None
+        State['_WinINF__Tail']=None
+        State['_WinINF__Current']=None
+        State['_WinINF__Positions']=None
+        State['_WinINF__LineIndex']=None
+        State['_WinINF__LineChanges']=[]
+        State['_WinINF__Graph']=None
+        return State
+
+    ## Pickle support
+    #  @param State (dict)
+    def __setstate__(self,State):
+        self.__dict__.update(State)
+        for Current in self.__Order:
+            if self.__Head is None:
+                self.__Head=Current
+            else:
+                self.__Tail.SetNext(Current)
+            self.__Tail=Current
+
+        if self.__Frozen:
+            self.Freeze()
 
     ## Lets go through the sections!
-    #  @return WinINF
+    #  Every call returns a new independent iterator, so nested loops and threads do not affect each other
+    #  @return iterator of INFsection
     def __iter__(self):
-        self.__Current=None
-        return self
+        Current=self.First()
+        while Current is not None:
+            yield Current
+            Current=Current.Next()
+
+    ## Makes file read-only: all sections are loaded and frozen (see INFsection.Freeze), all changes are rejected.
+    #  A frozen file can be shared between threads without locking on reads. The content is not changed by reads,
+    #  but caches of Resolve, GetGraph and section caches (see INFsection.Freeze) are filled on first use,
+    #  every cache entry is stored with one assignment, so it is safe under the GIL
+    def Freeze(self):
+        for Section in self:
+            Section.Freeze()
+        self.__Positions={id(Section):Index for Index,Section in enumerate(self.__Order)}
+        self.Sections()
+        self.__Frozen=True
+
+    ## Checks if file is read-only
+    #  @return bool
+    def IsFrozen(self):
+        return self.__Frozen
 
-    ## Lets go through the sections!
+    ## Returns read-only copy of the file, the file itself stays editable
+    #  \code{.py}
+    #  Snapshot = InfFile.Snapshot()
+    #  with concurrent.futures.ThreadPoolExecutor() as Executor:
+    #      Executor.map(lambda Name: Snapshot[Name], Names)
+    #  \endcode
+    #  @return WinINF
+    def Snapshot(self):
+        Copy=pickle.loads(pickle.dumps(self,pickle.HIGHEST_PROTOCOL))
+        Copy.Freeze()
+        return Copy
+
+    ## Function required for read-only files
+    #  @return bool True if file is frozen and the change is rejected
+    def __CheckFrozen(self):
+        if self.__Frozen:
+            self.__Diagnostics.Report(INFDiagnostics.frozen,self.__FileName,None,os.path.basename(self.__FileName))
+        return self.__Frozen
+
+    ## Returns next section (cursor is stored in the file, use iter() for independent iteration)
     #  @return INFsection
     def __next__(self):
         if self.__Current is not None:
@@ -759,32 +1438,407 @@ class WinINF:
                 raise StopIteration
             else:
                 self.__Current = self.__Head
+                self.__Current.Load()
                 return self.__Current
 
-    ## Returns section names.
+    ## Returns approximate memory size of all sections in bytes (see INFsection.GetMemoryUsage)
+    #  @return int
+    def GetMemoryUsage(self):
+        Seen=set()
+        Size=sys.getsizeof(self)+sys.getsizeof(self.__dict__)+sys.getsizeof(self.__Order)
+        for Index in (self.__SectionsDict,self.__NameIndex):
+            Size+=sys.getsizeof(Index)+sum(sys.getsizeof(Sections) for Sections in Index.values())
+        for Section in self:
+            Size+=Section.GetMemoryUsage(Seen)
+        return Size
+
+    ## Returns section names, a name is returned once even if the section is repeated in the file.
     #  @return list
     def Sections(self):
+        # after ApplyEdit names are sorted by their first section, as after parsing
+        if not self.__NamesSorted:
+            self.__SectionsDict=dict(sorted(self.__SectionsDict.items(),key=lambda Item: self.IndexOf(Item[1][0])))
+            self.__NamesSorted=True
         return self.__SectionsDict.keys()
 
+    ## Returns section by position, negative positions are counted from the end.
+    #  If position is out of range None returned.
+    #  @param Index (int)
+    #  @return INFsection
+    def GetSectionAt(self,Index):
+        if not -len(self.__Order) <= Index < len(self.__Order):
+            return None
+        Section=self.__Order[Index]
+        Section.Load()
+        return Section
+
+    ## Returns position of the section in the file
+    #  @param Section (INFsection)
+    #  @return int, -1 if section is not in the file
+    def IndexOf(self,Section):
+        if self.__Positions is None:
+            self.__Positions={id(Current):Index for Index,Current in enumerate(self.__Order)}
+        return self.__Positions.get(id(Section),-1)
+
     ## Returns first section
     #  @return INFsection
     def First(self):
+        if self.__Head is not None:
+            self.__Head.Load()
         return self.__Head
 
     ## Returns last section
     #  @return INFsection
     def Last(self):
+        if self.__Tail is not None:
+            self.__Tail.Load()
         return self.__Tail
 
+    ## Sets diagnostics collector for parser and file messages
+    #  \code{.py}
+    #  InfFile.SetDiagnostics(INFDiagnostics(INFDiagnostics.collect))
+    #  InfFile.ParseFile("./Intel.inf")
+    #  for d in InfFile.GetDiagnostics():
+    #      print(d.Code, d.File, d.Line, d.Message)
+    #  \endcode
+    #  Collector is also set for all sections of the file, so section messages use the new mode
+    #  @param Diagnostics (INFDiagnostics)
+    def SetDiagnostics(self,Diagnostics):
+        self.__Diagnostics=Diagnostics
+        for Section in self.__Order:
+            Section.SetDiagnostics(Diagnostics)
+
+    ## Returns diagnostics collector, it is cleared when a new file is parsed
+    #  @return INFDiagnostics
+    def GetDiagnostics(self):
+        return self.__Diagnostics
+
     ## Returns file name.
     #  @return str
     def GetFileName(self):
         return self.__FileName
 
+    ## Sets file name used by Save
+    #  @param Name (str)
+    def SetFileName(self,Name):
+        if self.__CheckFrozen():
+            return
+
+        self.__FileName=Name
+
     ## Returns section count/
     #  @return int
     def Count(self):
-        return self.__ItemCount
+        return len(self.__Order)
+
+    ## Replaces %token% references in the value with strings from [Strings.Locale] and [Strings] sections
+    #  Token names are case-insensitive, %% is replaced with %, unknown tokens are not changed.
+    #  Results are cached until Strings sections are changed.
+    #  \code{.py}
+    #  InfFile.ParseBytes(b'[Version]\nProvider=%Intel%\n[Strings]\nIntel="Intel Corporation"\n')
+    #  print(InfFile.Resolve(InfFile['Version']['Provider']))   # Intel Corporation
+    #  \endcode
+    #  @param Value (str)
+    #  @param Locale (str or int) for example "0409" or 0x409, if None only [Strings] is used
+    #  @return str
+    def Resolve(self,Value,Locale=None):
+        if '%' not in Value:
+            return Value
+
+        Table,Memo=self.__GetStrings(Locale)
+        Returner=Memo.get(Value)
+        if Returner is None:
+            Returner=self.__TokenRE.sub(lambda m: Table.get(m.group(1).casefold(),m.group(0)) if m.group(1) else '%',Value)
+            Memo[Value]=Returner
+        return Returner
+
+    ## Function required for Resolve
+    #  returns token table and resolved values cache for the locale
+    #  @param Locale (str or int)
+    #  @return dict,dict
+    def __GetStrings(self,Locale):
+        if type(Locale) is int:
+            Locale="{0:04x}".format(Locale)
+
+        Cache=self.__StringsCache.get(Locale)
+        if Cache is not None and Cache[0] == self.__Revision:
+            if all(Section.GetRevision() == Revision for Section,Revision in Cache[1]):
+                return Cache[2],Cache[3]
+
+        Names=["strings"]
+        if Locale:
+            Names.append("strings."+Locale.casefold())
+
+        Sections=[]
+        for n in Names:
+            Sections.extend(self.GetSections(n))
+
+        Table={}
+        for Section in Sections:
+            for k,v,c in Section:
+                if not k:
+                    continue
+                v=v.strip()
+                if len(v) > 1 and v[0] == '"' and v[-1] == '"':
+                    v=v[1:-1].replace('""','"')
+                Table[k.casefold()]=v
+
+        Memo={}
+        self.__StringsCache[Locale]=(self.__Revision,[(Section,Section.GetRevision()) for Section in Sections],Table,Memo)
+        return Table,Memo
+
+    ## Compares the file with another file: added, removed and changed sections and keys.
+    #  Section names and keys are case-insensitive, sections with the same name are merged,
+    #  white spaces and comments are ignored. Sections with equal fingerprints (see INFsection.GetFingerprint)
+    #  are skipped without comparing their content.
+    #  \code{.py}
+    #  Changes = OldFile.Diff(NewFile)
+    #  print(Changes.Unified())
+    #  json.dump(Changes.ToDict(), f)
+    #  \endcode
+    #  @param Other (WinINF) new version of the file
+    #  @return INFDiff
+    def Diff(self,Other):
+        Returner=INFDiff(self.__FileName,Other.GetFileName())
+        Names=[]
+        for Inf in (self,Other):
+            for Section in Inf:
+                Name=Section.GetName()
+                if Name.rstrip():
+                    Names.append(Name)
+
+        Seen=set()
+        for Name in Names:
+            Key=Name.casefold()
+            if Key in Seen:
+                continue
+            Seen.add(Key)
+
+            Old=self.GetSections(Name)
+            New=Other.GetSections(Name)
+            if not Old:
+                Returner.AddedSections.append(Name)
+            elif not New:
+                Returner.RemovedSections.append(Name)
+            elif [s.GetFingerprint() for s in Old] != [s.GetFingerprint() for s in New]:
+                Changes=INFDiff.CompareSections(Old,New)
+                if Changes:
+                    Returner.ChangedSections[Name]=Changes
+        return Returner
+
+    ## Returns graph of section references (CopyFiles, AddReg, AddService, Needs, models...).
+    #  The graph is built on first call and updated for changed sections on next calls
+    #  \code{.py}
+    #  Graph = InfFile.GetGraph()
+    #  print(Graph.GetClosure("i830M"))
+    #  print(Graph.GetDangling())
+    #  \endcode
+    #  @return INFGraph
+    def GetGraph(self):
+        if self.__Graph is None:
+            self.__Graph=INFGraph(self)
+        else:
+            self.__Graph.Update()
+        return self.__Graph
+
+    ## Returns file text used by ApplyEdit: lines before the first section that are not stored in sections
+    #  (empty lines, lines with errors) followed by all sections (see INFsection.Save).
+    #  For files parsed with fKeepRaw it is the original text while nothing is changed
+    #  @return str
+    def GetText(self):
+        return self.__Prefix+"".join(Section.Save() for Section in self)
+
+    ## Returns section that contains the line of GetText
+    #  @param Line (int) line number, starts from 0
+    #  @return INFsection, None if the line is before the first section or after the end of the file
+    def GetSectionAtLine(self,Line):
+        Counts,Starts=self.__GetLineIndex()
+        Index=bisect_right(Starts,Line)-1
+        if Index <= 0 or Index >= len(Counts):
+            return None
+        return self.__Order[Index-1]
+
+    ## Replaces lines of the file text (see GetText) and parses only the changed part.
+    #  Usually only the edited section is parsed again, sections are split or merged when header lines
+    #  are added or removed. Sections that are not changed are kept (the same objects).
+    #  New sections keep their text (see INFsection.GetRaw), so GetText returns the edited text.
+    #  \code{.py}
+    #  InfFile.ParseFile("./Intel.inf", fKeepRaw=True)
+    #  InfFile.ApplyEdit(12, 13, "Class=Net\n")            # replace line 12
+    #  InfFile.ApplyEdit(40, 40, "[NewSection]\nkey=1\n")  # insert lines before line 40
+    #  \endcode
+    #  @param StartLine (int) first replaced line, starts from 0
+    #  @param EndLine (int) line after the last replaced line, StartLine - insert lines
+    #  @param NewText (str) new lines, line break is added to the last line if it is missing
+    #  @return list of INFsection new sections
+    def ApplyEdit(self,StartLine,EndLine,NewText):
+        if self.__CheckFrozen():
+            return []
+
+        NewText=NewText.replace("\r\n","\n").replace("\r","\n")
+        if NewText and not NewText.endswith("\n"):
+            NewText+="\n"
+
+        Counts,Starts=self.__GetLineIndex()
+        StartLine=min(max(StartLine,0),Starts[-1])
+        EndLine=min(max(EndLine,StartLine),Starts[-1])
+
+        # chunk 0 is prefix, chunk i is section i-1, edited header belongs to the previous chunk,
+        # the first section may have no header, so it is parsed with the prefix
+        First=bisect_right(Starts,StartLine,0,len(Counts))-1
+        if StartLine == Starts[First]:
+            First-=1
+        if First <= 1:
+            First=0
+        Last=max(bisect_right(Starts,EndLine-1,0,len(Counts))-1,First)
+        if First == 0:
+            Last=max(Last,min(1,len(Counts)-1))
+
+        Texts=[self.__Prefix if i == 0 else self.__Order[i-1].Save() for i in range(First,Last+1)]
+        Lines="".join(Texts).splitlines(True)
+        Before="".join(Lines[:StartLine-Starts[First]])
+        After="".join(Lines[EndLine-Starts[First]:])
+        if Before and not Before.endswith("\n") and (NewText or After):
+            Before+="\n"
+        Text=Before+NewText+After
+
+        Parser=WinINF()
+        Parser.__Diagnostics=self.__Diagnostics
+        Parser.__FileName=self.__FileName
+        Parser.__KeepRaw=True
+        Parser.__ParseLines(io.StringIO(Text),Starts[First])
+        NewSections=Parser.__Order
+        NewTexts=[Parser.__Prefix] if First == 0 else []
+        NewTexts+=[Section.GetRaw() for Section in NewSections]
+        Indexed={id(Section) for Sections in Parser.__SectionsDict.values() for Section in Sections}
+
+        # sections with the same text at the beginning and at the end are kept
+        OldSections=self.__Order[max(First-1,0):Last]
+        OldTexts=Texts[1:] if First == 0 else Texts
+        Begin=0
+        while Begin < min(len(OldSections),len(NewSections)) and OldTexts[Begin] == NewSections[Begin].GetRaw():
+            Begin+=1
+        End=0
+        while End < min(len(OldSections),len(NewSections))-Begin and OldTexts[-1-End] == NewSections[-1-End].GetRaw():
+            End+=1
+
+        Inserted=NewSections[Begin:len(NewSections)-End]
+        for Section in Inserted:
+            Section.SetNext(None)
+            Section.SetPrevious(None)
+        self.__Replace(max(First-1,0)+Begin,len(OldSections)-Begin-End,Inserted,Indexed)
+
+        if First == 0:
+            self.__Prefix=Parser.__Prefix
+        Counts[First:Last+1]=[WinINF.__LineCount(Text) for Text in NewTexts]
+        for Section in Inserted:
+            Section.SetListener(self.__LineChanges.append)
+        self.__LineIndex[0]=self.__Revision
+        self.__LineIndex[3]=min(self.__LineIndex[3],First)
+        return Inserted
+
+    ## Function required for ApplyEdit and GetSectionAtLine
+    #  returns number of lines of the prefix and every section and line starts (the last start is the line count).
+    #  The index is built again after changes of the section list. Every counted section reports its next change
+    #  (see INFsection.SetListener), so only changed sections are counted again and starts are updated from the
+    #  first changed section
+    #  @return (list of int, list of int)
+    def __GetLineIndex(self):
+        Index=self.__LineIndex
+        if Index is None or Index[0] != self.__Revision:
+            for Section in self.__Order:
+                Section.Load()
+            del self.__LineChanges[:]
+            Counts=[WinINF.__LineCount(self.__Prefix)]+[self.__CountLines(Section) for Section in self.__Order]
+            # revision, counts, starts, number of counts with valid next start
+            Index=self.__LineIndex=[self.__Revision,Counts,[0],0]
+
+        Revision,Counts,Starts,Valid=Index
+        for Section in self.__LineChanges:
+            Position=self.IndexOf(Section)
+            if Position >= 0:
+                Counts[Position+1]=self.__CountLines(Section)
+                Valid=min(Valid,Position+1)
+        del self.__LineChanges[:]
+
+        if Valid < len(Counts):
+            Starts[Valid:]=itertools.accumulate([Starts[Valid]]+Counts[Valid:])
+            Index[3]=len(Counts)
+        return Counts,Starts
+
+    ## Function required for line index
+    #  returns number of lines of the section text, the next change of the section is reported to the index
+    #  @param Section (INFsection)
+    #  @return int
+    def __CountLines(self,Section):
+        Count=WinINF.__LineCount(Section.Save())
+        Section.SetListener(self.__LineChanges.append)
+        return Count
+
+    ## Function required for line index
+    #  @param Text (str)
+    #  @return int number of lines, the last line may have no line break
+    @staticmethod
+    def __LineCount(Text):
+        return Text.count("\n")+(1 if Text and not Text.endswith("\n") else 0)
+
+    ## Function required for ApplyEdit
+    #  replaces Count sections from position Index with new sections
+    #  @param Index (int)
+    #  @param Count (int)
+    #  @param Sections list of INFsection
+    #  @param Indexed (set) ids of sections that are added to the name index
+    def __Replace(self,Index,Count,Sections,Indexed):
+        for Section in self.__Order[Index:Index+Count]:
+            self.__Unindex(Section)
+
+        Previous=self.__Order[Index-1] if Index > 0 else None
+        Next=self.__Order[Index+Count] if Index+Count < len(self.__Order) else None
+        Chain=[Previous]+list(Sections)+[Next]
+        for p,n in zip(Chain,Chain[1:]):
+            if p is None:
+                self.__Head=n
+                if n is not None:
+                    n.SetPrevious(None)
+            elif n is None:
+                p.SetNext(None)
+            else:
+                p.SetNext(n)
+            if n is None:
+                self.__Tail=p
+
+        if self.__Positions is not None and len(Sections) == Count:
+            for Offset,Section in enumerate(Sections):
+                del self.__Positions[id(self.__Order[Index+Offset])]
+                self.__Positions[id(Section)]=Index+Offset
+        else:
+            self.__Positions=None
+        self.__Order[Index:Index+Count]=Sections
+        for Section in Sections:
+            if id(Section) in Indexed:
+                self.__AddToIndex(Section)
+        self.__Revision+=1
+        self.__NamesSorted=False
+
+    ## Searches keys, values or comments matching the pattern in all sections (see INFsection.Query)
+    #  \code{.py}
+    #  for Section,Index,k,v,c in InfFile.Query("i8[34]5G", INFsection.match_regex):
+    #      print(Section.GetName(), Index, k, v)
+    #  \endcode
+    #  @param Pattern (str)
+    #  @param Mode (int) INFsection.match_substring, INFsection.match_regex or INFsection.match_glob
+    #  @param fKeys (bool) search in keys
+    #  @param fValues (bool) search in values
+    #  @param fComments (bool) search in comments
+    #  @param fIgnoreCase (bool)
+    #  @return generator of (section, index, key, value, comment)
+    def Query(self,Pattern,Mode=1,fKeys=True,fValues=True,fComments=False,fIgnoreCase=False):
+        Match=INFsection.GetMatcher(Pattern,Mode,fIgnoreCase)
+        Current=self.First()
+        while Current is not None:
+            for Index,k,v,c in Current.Query(Match,Mode,fKeys,fValues,fComments):
+                yield Current,Index,k,v,c
+            Current=Current.Next()
 
     ## Returns section by name. If section not present None returned.
     #  `InfFile['Name']`
@@ -794,40 +1848,110 @@ class WinINF:
         return self.GetSection(k)
 
     ## Returns section by name. If section not present None returned.
+    #  If the section is repeated in the file, the last one is returned (see GetSections)
     #  @param Name (str)
     #  @return INFsection
     def GetSection(self,Name):
-        return self.__SectionsDict.get(Name)
+        Sections=self.__SectionsDict.get(Name)
+        if Sections is None:
+            return None
+        Section=Sections[-1]
+        Section.Load()
+        return Section
+
+    ## Returns all sections with the name in file order.
+    #  Windows merges sections with the same name, so all of them must be processed
+    #  \code{.py}
+    #  for Section in InfFile.GetSections("strings"):
+    #      print(Section.GetName(), len(Section))
+    #  \endcode
+    #  @param Name (str)
+    #  @param fIgnoreCase (bool) section names are case-insensitive in INF files
+    #  @return list of INFsection
+    def GetSections(self,Name,fIgnoreCase=True):
+        if fIgnoreCase:
+            Sections=self.__NameIndex.get(Name.casefold(),())
+        else:
+            Sections=self.__SectionsDict.get(Name,())
+
+        for Section in Sections:
+            Section.Load()
+        return list(Sections)
 
-    ## Adds section
+    ## Adds section to the end of the file
     #  @param Section (INFsection)
     def AddSection(self, Section: INFsection):
+        self.__Insert(Section,self.__Tail)
+
+    ## Adds section before another section of the file
+    #  @param Section (INFsection) new section
+    #  @param Reference (INFsection) section of the file
+    def AddSectionBefore(self, Section: INFsection, Reference: INFsection):
+        Index=self.IndexOf(Reference)
+        if Index < 0:
+            self.__Diagnostics.Report(INFDiagnostics.unknown_section,self.__FileName,None,Reference.GetName())
+            return
+        self.__Insert(Section,self.__Order[Index-1] if Index else None)
+
+    ## Adds section after another section of the file
+    #  @param Section (INFsection) new section
+    #  @param Reference (INFsection) section of the file
+    def AddSectionAfter(self, Section: INFsection, Reference: INFsection):
+        if self.IndexOf(Reference) < 0:
+            self.__Diagnostics.Report(INFDiagnostics.unknown_section,self.__FileName,None,Reference.GetName())
+            return
+        self.__Insert(Section,Reference)
+
+    ## Function required for AddSection
+    #  checks section and inserts it after Previous
+    #  @param Section (INFsection)
+    #  @param Previous (INFsection) None - insert to the beginning
+    def __Insert(self,Section,Previous):
+        if self.__CheckFrozen():
+            return
+
         if Section.IsValid():
-            print("You can add only invalid sections!")
+            self.__Diagnostics.Report(INFDiagnostics.valid_section,self.__FileName)
             return
         if not Section.CheckSection():
-            print("Error: Can't add emty section!")
+            self.__Diagnostics.Report(INFDiagnostics.empty_section,self.__FileName)
             return
 
         Section.SetValid()
+        self.__Link(Section,Previous,bool(Section.GetName().rstrip()))
+        self.__Revision += 1
 
-        if self.__Head is None:
-            self.__Head = Section
-            self.__Tail = Section
-        else:
-            self.__Tail.SetNext(Section)
-            self.__Tail = Section
+    ## Renames section of the file and updates the section index
+    #  @param Section (INFsection)
+    #  @param NewName (str)
+    def RenameSection(self, Section: INFsection, NewName):
+        if self.__CheckFrozen():
+            return
+
+        if self.IndexOf(Section) < 0:
+            self.__Diagnostics.Report(INFDiagnostics.unknown_section,self.__FileName,None,Section.GetName())
+            return
 
-        if Section.GetName().rstrip():
-            self.__SectionsDict[Section.GetName()] = Section
-        self.__ItemCount += 1
+        self.__Unindex(Section)
+        Section.SetName(NewName)
+        if NewName.rstrip():
+            self.__AddToIndex(Section)
+        self.__Revision += 1
 
     ## Removes selected section!
     #  @param Section (INFsection)
     def RemoveSection(self, Section: INFsection):
+        if self.__CheckFrozen():
+            return
+
         if not Section.IsValid():
             return
 
+        Index=self.IndexOf(Section)
+        if Index < 0:
+            return
+
+        self.__Revision += 1
         p=Section.Previous()
         n=Section.Next()
 
@@ -846,191 +1970,680 @@ class WinINF:
                 self.__Tail = p
                 self.__Head = n
 
+        del self.__Order[Index]
+        self.__Positions=None
+        self.__Unindex(Section)
+
+    ## Function required for section index
+    #  links section after Previous and adds it to the index
+    #  @param Section (INFsection)
+    #  @param Previous (INFsection) None - insert to the beginning
+    #  @param fIndex (bool) add section name to the index
+    def __Link(self,Section,Previous,fIndex=True):
+        if Previous is self.__Tail:
+            if self.__Tail is None:
+                self.__Head=Section
+            else:
+                self.__Tail.SetNext(Section)
+            self.__Tail=Section
+            if self.__Positions is not None:
+                self.__Positions[id(Section)]=len(self.__Order)
+            self.__Order.append(Section)
+            if fIndex:
+                self.__AddToIndex(Section)
+            return
+
+        if Previous is None:
+            Section.SetNext(self.__Head)
+            self.__Head=Section
+            Index=0
+        else:
+            Index=self.IndexOf(Previous)+1
+            Section.SetNext(self.__Order[Index])
+            Previous.SetNext(Section)
+
+        self.__Order.insert(Index,Section)
+        self.__Positions=None
+        if fIndex:
+            self.__AddToIndex(Section)
+
+    ## Function required for section index
+    #  adds section to name lookups, sections with the same name are kept in file order.
+    #  Names are sorted again by Sections if the section is not added to the end of the file
+    #  @param Section (INFsection)
+    def __AddToIndex(self,Section):
+        Name=Section.GetName()
+        if Section is not self.__Tail:
+            self.__NamesSorted=False
+        for Index,Key in ((self.__SectionsDict,Name),(self.__NameIndex,Name.casefold())):
+            Sections=Index.get(Key)
+            if Sections is None:
+                Index[Key]=[Section]
+            else:
+                Sections.append(Section)
+                if len(Sections) > 1 and Sections[-1] is not self.__Tail:
+                    Sections.sort(key=self.IndexOf)
+
+    ## Function required for section index
+    #  removes section from name lookups
+    #  @param Section (INFsection)
+    def __Unindex(self,Section):
+        Name=Section.GetName()
+        for Index,Key in ((self.__SectionsDict,Name),(self.__NameIndex,Name.casefold())):
+            Sections=Index.get(Key)
+            if Sections is None:
+                continue
+            if len(Sections) > 1 and Sections[0] is Section:
+                # the name moves to the position of its next section
+                self.__NamesSorted=False
+            Sections[:]=[Current for Current in Sections if Current is not Section]
+            if not Sections:
+                del Index[Key]
+
     ## Opens INF file.
     #  If Name Full faile path to inf file
+    #  In lazy mode only section headers are found while parsing, section content is parsed
+    #  when the section is accessed first time (GetSection, operator[], iteration, First, Last, Next...)
     #  @param Name (str)
     #  @param codec (str) for example can be "UTF-8"
-    def ParseFile(self,Name,codec=None):
+    #  With fKeepRaw original text of each section is kept and Save writes it unchanged
+    #  for sections that were not modified (see INFsection.IsModified)
+    #  @param fLazy (bool) lazy mode
+    #  @param fKeepRaw (bool) keep original text of sections
+    def ParseFile(self,Name,codec=None,fLazy=False,fKeepRaw=False):
+        if self.__CheckFrozen():
+            return
+
+        self.__Clear()
+        self.__FileCodec=codec
+        self.__FileName=Name
+        self.__KeepRaw=fKeepRaw
+
+        with open(Name,encoding=self.__FileCodec) as f:
+            if fLazy:
+                self.__ParseLazy(f.read())
+            else:
+                self.__ParseLines(f)
+
+    ## Parses INF file content from bytes, memoryview, mmap or any other bytes-like object.
+    #  If codec is None, the encoding is detected by BOM or UTF-16/UTF-8 sniffing (see DetectCodec)
+    #  and the data is decoded in one pass. The detected codec is used by Save.
+    #  \code{.py}
+    #  with open("./Intel.inf", "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+    #      InfFile.ParseBytes(m, Name="./Intel.inf")
+    #  \endcode
+    #  @param data (bytes-like)
+    #  @param codec (str) for example can be "UTF-16"
+    #  @param Name (str) file name used by Save and in messages
+    #  @param fLazy (bool) lazy mode (see ParseFile)
+    #  @param fKeepRaw (bool) keep original text of sections (see ParseFile)
+    def ParseBytes(self,data,codec=None,Name="",fLazy=False,fKeepRaw=False):
+        if self.__CheckFrozen():
+            return
+
+        Text=None
+        if codec is None:
+            codec=WinINF.DetectCodec(data,fUTF8Check=False)
+            if codec is None:
+                try:
+                    Text=str(data,"utf-8")
+                    codec="utf-8"
+                except UnicodeDecodeError:
+                    codec=locale.getpreferredencoding(False)
+
+        if Text is None:
+            Text=str(data,codec)
+
+        self.__Clear()
+        self.__FileCodec=codec
+        self.__FileName=Name
+        self.__KeepRaw=fKeepRaw
+
+        if fLazy:
+            self.__ParseLazy(Text.replace("\r\n","\n").replace("\r","\n"))
+        else:
+            self.__ParseLines(io.StringIO(Text,newline=None))
+
+    ## Parses INF file content from a binary file object
+    #  @param f binary file object
+    #  @param codec (str) if None, the encoding is detected (see ParseBytes)
+    #  @param Name (str) if None, the name of the file object is used
+    #  @param fLazy (bool) lazy mode (see ParseFile)
+    #  @param fKeepRaw (bool) keep original text of sections (see ParseFile)
+    def ParseStream(self,f,codec=None,Name=None,fLazy=False,fKeepRaw=False):
+        if Name is None:
+            Name=getattr(f,"name","")
+            if not isinstance(Name,str):
+                Name=""
+
+        self.ParseBytes(f.read(),codec,Name,fLazy,fKeepRaw)
+
+    ## Parses many INF files in a process pool
+    #  Returns iterator of (path, WinINF or exception, messages) tuples, messages is a list
+    #  of parser diagnostics (INFDiagnostic). A failed file does not stop the batch.
+    #  \code{.py}
+    #  for Name, Inf, Messages in WinINF.ParseMany(Paths, workers=8, chunksize=16):
+    #      if isinstance(Inf, Exception):
+    #          print(Name, "failed:", Inf)
+    #  \endcode
+    #  @param Paths iterable of str
+    #  @param codec (str) if None, the encoding is detected (see ParseBytes)
+    #  @param workers (int) number of processes, None - cpu count, 0 - parse in current process
+    #  @param chunksize (int) number of files sent to a worker at once
+    #  @param fOrdered (bool) if False, results are returned as they are completed
+    #  @return generator of (str, WinINF or Exception, list)
+    @staticmethod
+    def ParseMany(Paths,codec=None,workers=None,chunksize=1,fOrdered=True):
+        Paths=list(Paths)
+        chunksize=max(1,chunksize)
+        Chunks=[Paths[i:i+chunksize] for i in range(0,len(Paths),chunksize)]
+
+        if workers == 0:
+            for Chunk in Chunks:
+                yield from _ParseFilesWorker(Chunk,codec)
+            return
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as Executor:
+            Futures={Executor.submit(_ParseFilesWorker,Chunk,codec):Chunk for Chunk in Chunks}
+            try:
+                for Future in (Futures if fOrdered else concurrent.futures.as_completed(Futures)):
+                    try:
+                        yield from Future.result()
+                    except Exception as e:
+                        for Name in Futures[Future]:
+                            yield Name,e,[]
+            finally:
+                for Future in Futures:
+                    Future.cancel()
+
+    ## Parses all INF files of the directory in a process pool (see ParseMany)
+    #  @param Path (str) directory
+    #  @param pattern (str) glob pattern
+    #  @param fRecursive (bool) search in subdirectories
+    #  @return generator of (str, WinINF or Exception, list)
+    @staticmethod
+    def ParseDirectory(Path,pattern="*.inf",fRecursive=False,codec=None,workers=None,chunksize=1,fOrdered=True):
+        if fRecursive:
+            pattern=os.path.join("**",pattern)
+        Paths=sorted(glob.glob(os.path.join(glob.escape(Path),pattern),recursive=fRecursive))
+        return WinINF.ParseMany(Paths,codec,workers,chunksize,fOrdered)
+
+    ## Parses INF file in an executor without blocking the event loop (see ParseFile)
+    #  If the awaiting task is cancelled, parsing is cancelled if it is not started yet
+    #  \code{.py}
+    #  InfFile = await WinINF.ParseFileAsync("./Intel.inf")
+    #  \endcode
+    #  @param Name (str)
+    #  @param codec (str) for example can be "UTF-8"
+    #  @param fLazy (bool) lazy mode (see ParseFile)
+    #  @param fKeepRaw (bool) keep original text of sections (see ParseFile)
+    #  @param executor (concurrent.futures.Executor) thread or process pool, None - default executor of the event loop
+    #  @return WinINF
+    @staticmethod
+    async def ParseFileAsync(Name,codec=None,fLazy=False,fKeepRaw=False,executor=None):
+        Loop=asyncio.get_running_loop()
+        return await Loop.run_in_executor(executor,_ParseFileWorker,Name,codec,fLazy,fKeepRaw)
+
+    ## Parses many INF files in an executor, at most limit files are parsed at the same time
+    #  Returns async iterator of (path, WinINF or exception, messages) tuples as they are completed (see ParseMany).
+    #  Files that are not started yet are cancelled when the iteration is stopped or the task is cancelled.
+    #  \code{.py}
+    #  async for Name, Inf, Messages in WinINF.ParseManyAsync(Paths, limit=16):
+    #      if isinstance(Inf, Exception):
+    #          print(Name, "failed:", Inf)
+    #  \endcode
+    #  @param Paths iterable of str
+    #  @param codec (str) if None, the encoding is detected (see ParseBytes)
+    #  @param executor (concurrent.futures.Executor) thread or process pool, None - default executor of the event loop
+    #  @param limit (int) maximum number of files parsed at the same time
+    #  @return async generator of (str, WinINF or Exception, list)
+    @staticmethod
+    async def ParseManyAsync(Paths,codec=None,executor=None,limit=8):
+        Loop=asyncio.get_running_loop()
+        Paths=iter(Paths)
+        limit=max(1,limit)
+        Pending={}
+        try:
+            while True:
+                for Name in Paths:
+                    Pending[Loop.run_in_executor(executor,_ParseFilesWorker,[Name],codec)]=Name
+                    if len(Pending) >= limit:
+                        break
+
+                if not Pending:
+                    break
+
+                Done=(await asyncio.wait(Pending,return_when=asyncio.FIRST_COMPLETED))[0]
+                for Future in Done:
+                    Name=Pending.pop(Future)
+                    try:
+                        Results=Future.result()
+                    except Exception as e:
+                        Results=[(Name,e,[])]
+                    for Result in Results:
+                        yield Result
+        finally:
+            for Future in Pending:
+                Future.cancel()
+
+    ## Detects INF file encoding
+    #  Checks UTF-8/UTF-16 BOM, then UTF-16 without BOM by zero bytes, then UTF-8,
+    #  otherwise the locale default is returned (same as ParseFile without codec)
+    #  @param data (bytes-like)
+    #  @param fUTF8Check (bool) if False, None is returned when there is no BOM and no zero bytes
+    #  @return str
+    @staticmethod
+    def DetectCodec(data,fUTF8Check=True):
+        head=bytes(data[:4])
+        if head.startswith(codecs.BOM_UTF8):
+            return "utf-8-sig"
+        if head.startswith(codecs.BOM_UTF16_LE) or head.startswith(codecs.BOM_UTF16_BE):
+            return "utf-16"
+        if len(head) >= 2:
+            if head[0] and not head[1]:
+                return "utf-16-le"
+            if not head[0] and head[1]:
+                return "utf-16-be"
+
+        if not fUTF8Check:
+            return None
+
+        try:
+            str(data,"utf-8")
+            return "utf-8"
+        except UnicodeDecodeError:
+            return locale.getpreferredencoding(False)
+
+    ## Function required for parser
+    #  resets file content
+    def __Clear(self):
         self.__Head=None
         self.__Tail=None
         self.__Current=None
-        self.__ItemCount=0
-        self.__SectionsDict = {}
-        self.__FileCodec=codec
+        self.__Order=[]
+        self.__Positions={}
+        self.__SectionsDict={}
+        self.__NameIndex={}
+        self.__Revision+=1
+        self.__StringsCache={}
+        self.__Prefix=""
+        self.__LineIndex=None
+        self.__LineChanges=[]
+        self.__Graph=None
+        self.__NamesSorted=True
+        self.__Diagnostics.Clear()
 
-        self.__FileName=Name
-        f=open(Name,encoding=self.__FileCodec)
-
-        #SepRE=re.compile('[^";=]*("|;|=)?')
-        SepRE = re.compile('[^][";=]*(\\]|\\[|"|;|=)?')
-        KeyRE = re.compile('[^"]*(")')
-        #ValueRE = re.compile('[^";=]*("|;)?')
-        ValueRE = re.compile('[^";=]*("|;)?')
-
-        EmptyRE = re.compile('\\s*$')
-        CommentRE = re.compile("\\s*(;.*)?$")
-        SectRE = re.compile(" *\\[([^]]*)\\](\\s*;.*)?")
-
-        for lineNumber, line in enumerate(f):
-            line = line.rstrip()
-            if line == "" or EmptyRE.match(line) is not None:
-                if self.__Tail is not None:
-                    self.__Tail.AddComment()
+    ## Function required for parser
+    #  parses lines of INF file, lines are added to sections directly without building parser events
+    #  (see ParseEvents), original text of lines is collected only if it is kept
+    #  @param f iterable of str
+    #  @param FirstLine (int) line number of the first line
+    def __ParseLines(self,f,FirstLine=0):
+        Raw=[] if self.__KeepRaw else None
+        Tail=self.__Tail
+        fNamed=Tail is not None and Tail.GetName() != ""
+        ClassifyLine=self.__ClassifyLine
+
+        for lineNumber, RawLine in enumerate(f,FirstLine):
+            Type,a,b,c=ClassifyLine(RawLine.rstrip(),lineNumber)
+
+            if Type == WinINF.event_section:
+                if Tail is not None:
+                    Tail.SetValid()
+                    if Raw is not None:
+                        Tail.SetRaw("".join(Raw))
+                        Raw.clear()
+                Tail=self.__AddHeader(a,b)
+                fNamed=Tail.GetName() != ""
+            elif Tail is None:
+                if Type != WinINF.event_comment:
+                    self.__Prefix+=RawLine
+
+                if Type == WinINF.event_blank:
+                    self.__Diagnostics.Report(INFDiagnostics.empty_line,self.__FileName,lineNumber)
+                elif Type == WinINF.event_comment:
+                    Tail = INFsection(True)
+                    Tail.SetDiagnostics(self.__Diagnostics)
+                    Tail.AddComment(a,fraw=True)
+                    self.__Link(Tail,None,False)
+                elif Type == WinINF.event_row:
+                    self.__Diagnostics.Report(INFDiagnostics.no_section,self.__FileName,lineNumber)
+                if Type != WinINF.event_comment:
+                    continue
+            elif Type == WinINF.event_row:
+                if not fNamed:
+                    self.__Diagnostics.Report(INFDiagnostics.no_section,self.__FileName,lineNumber)
                 else:
-                    print("Warning: File [{0}] Line {1} An empty line with no section! [skiped]".format(os.path.basename(self.__FileName),lineNumber))
-                continue
+                    Tail.AddData(a,b or None,c,fraw=True)
+            elif Type == WinINF.event_comment:
+                Tail.AddComment(a,fraw=True)
+            elif Type == WinINF.event_blank:
+                Tail.AddComment()
 
-            ms = CommentRE.match(line)
-            if ms is not None:
-                if self.__Head is None:
-                    NewSection = INFsection(True)
-                    NewSection.AddComment(line,fraw=True)
-                    self.__Head=NewSection
-                    self.__Tail=NewSection
-                    self.__ItemCount += 1
-                else:
-                    self.__Tail.AddComment(line,fraw=True)
+            if Raw is not None:
+                Raw.append(RawLine)
 
-                continue
+        if Tail is not None:
+            Tail.SetValid()
+            if Raw is not None:
+                Tail.SetRaw("".join(Raw))
 
-            ms = SectRE.match(line)
-            if ms is not None:
-                NewSection=INFsection(True)
-                NewSection.SetName(ms.group(1).lstrip().rstrip())
+    ## Function required for parser
+    #  parses only section headers, content of each section is parsed by __LoadSection on first access
+    #  @param Text (str) file content with "\n" line endings
+    def __ParseLazy(self,Text):
+        Headers=self.__LazySectRE.finditer(Text)
+        ms=next(Headers,None)
+
+        End=len(Text) if ms is None else ms.start()
+        self.__ParseLines(io.StringIO(Text[:End]))
+        lineNumber=Text.count("\n",0,End)
+
+        while ms is not None:
+            Start=ms.start()
+            RawStart=Start if self.__KeepRaw else None
+            End=Text.find("\n",Start)
+            if End < 0:
+                End=len(Text)
+            Header=self.__SectRE.match(Text[Start:End].rstrip())
+            NewSection=self.__AddHeader(Header.group(1).lstrip().rstrip(),Header.group(2))
+
+            ms=next(Headers,None)
+            Start=min(End+1,len(Text))
+            End=len(Text) if ms is None else ms.start()
+            NewSection.SetLoader(functools.partial(self.__LoadSection,Text,Start,End,lineNumber+1,RawStart,self.__FileName))
+            lineNumber+=1+Text.count("\n",Start,End)
+
+    ## Function required for parser
+    #  parses section content found by __ParseLazy
+    #  @param Text (str) file content
+    #  @param Start (int) start position of section content
+    #  @param End (int) end position of section content
+    #  @param FirstLine (int) line number of the first content line
+    #  @param RawStart (int) start position of section header if original text is kept, otherwise None
+    #  @param FileName (str) file name used in messages, the file may be saved with another name before loading
+    #  @param Section (INFsection)
+    def __LoadSection(self,Text,Start,End,FirstLine,RawStart,FileName,Section):
+        Parser=WinINF()
+        Parser.__Diagnostics=self.__Diagnostics
+        Parser.__FileName=FileName
+        # content has no headers (see __ParseLazy), so all lines are added to the section
+        Parser.__Tail=Section
+        Parser.__ParseLines(io.StringIO(Text[Start:End]),FirstLine)
 
-                if ms.group(2) is not None:
-                    NewSection.SetNameComment(ms.group(2))
+        if RawStart is not None:
+            Section.SetRaw(Text[RawStart:End])
 
-                if self.__Head is None:
-                    self.__Head=NewSection
-                    self.__Tail=NewSection
-                else:
-                    self.__Tail.SetNext(NewSection)
-                    self.__Tail.SetValid()
-                    self.__Tail=NewSection
+    ## Function required for parser
+    #  adds new section after last section
+    #  @param Name (str) section name
+    #  @param NameComment (str) comment after section name or None
+    #  @return INFsection
+    def __AddHeader(self,Name,NameComment):
+        NewSection=INFsection(True)
+        NewSection.SetDiagnostics(self.__Diagnostics)
+        NewSection.SetName(Name)
+
+        if NameComment is not None:
+            NewSection.SetNameComment(NameComment)
+
+        self.__Link(NewSection,self.__Tail)
+        return NewSection
+
+    ## Function required for parser
+    #  classifies one line, the same rules are used by the parser and by ParseEvents
+    #  @param line (str) line without trailing white spaces
+    #  @param lineNumber (int)
+    #  @return (type, a, b, c) as in ParseEvents, a is None for event_blank
+    def __ClassifyLine(self,line,lineNumber):
+        if not line:
+            return WinINF.event_blank,None,None,None
+
+        first = line.lstrip()[0]
+        if first == ';':
+            return WinINF.event_comment,line,None,None
+
+        if first == '[':
+            ms = self.__SectRE.match(line)
+            if ms is not None:
+                return WinINF.event_section,ms.group(1).lstrip().rstrip(),ms.group(2),None
+
+        k,v,c,f_error=self.__TokenizeLine(line,lineNumber)
+        if f_error:
+            return WinINF.event_error,None,None,None
+        return WinINF.event_row,k,v,c
+
+    ## Parses INF file to a stream of events without building sections, memory use does not depend on file size
+    #  Each event is a tuple (type, line number, a, b, c, raw text):
+    #  type            |  a             |  b                        |  c       |
+    #  --------------- |--------------- |-------------------------- |--------- |
+    #  event_section   |section name    |comment after name or None |None      |
+    #  event_row       |key             |value                      |comment   |
+    #  event_comment   |comment line    |None                       |None      |
+    #  event_blank     |number of lines |None                       |None      |
+    #  event_error     |None            |None                       |None      |
+    #  Error lines are reported to Diagnostics and skipped by the parser.
+    #  \code{.py}
+    #  for Type, Line, a, b, c, Raw in WinINF.ParseEvents("./Intel.inf"):
+    #      if Type == WinINF.event_section:
+    #          Section = a
+    #      elif Type == WinINF.event_row:
+    #          print(Section, a.rstrip(), b.strip())
+    #  \endcode
+    #  @param Source (str) file name or iterable of text lines (for example text file object)
+    #  @param codec (str) for example can be "UTF-8"
+    #  @param Diagnostics (INFDiagnostics) if None, messages are printed
+    #  @return generator of tuple
+    @staticmethod
+    def ParseEvents(Source,codec=None,Diagnostics=None):
+        Parser=WinINF()
+        if Diagnostics is not None:
+            Parser.SetDiagnostics(Diagnostics)
+
+        if isinstance(Source,str):
+            Parser.__FileName=Source
+            with open(Source,encoding=codec) as f:
+                yield from Parser.__Events(f)
+        else:
+            Name=getattr(Source,"name","")
+            Parser.__FileName=Name if isinstance(Name,str) else ""
+            yield from Parser.__Events(Source)
 
-                self.__SectionsDict[NewSection.GetName()]=NewSection
-                self.__ItemCount+=1
+    ## Function required for parser
+    #  splits lines to parser events (see ParseEvents), consecutive empty lines are returned as one event
+    #  @param f iterable of str
+    #  @param FirstLine (int) line number of the first line
+    #  @return generator of tuple
+    def __Events(self,f,FirstLine=0):
+        Blank=[]
+        BlankLine=0
+
+        for lineNumber, RawLine in enumerate(f,FirstLine):
+            Type,a,b,c=self.__ClassifyLine(RawLine.rstrip(),lineNumber)
+            if Type == WinINF.event_blank:
+                if not Blank:
+                    BlankLine=lineNumber
+                Blank.append(RawLine)
                 continue
 
-            SeparatorRE = SepRE
-            p=0
-            fv=False
-            f_open=False
-            f_error=False
-            k=""
-            v=""
-            c=""
-            while p != len(line):
-                ma = SeparatorRE.match(line,pos=p)
-                if ma is None:
-                    if f_open:
-                        print("Warning: File [{0}] Line {1} Contains an unclosed quote.".format(os.path.basename(self.__FileName),lineNumber))
-
-                    if v:
-                        v += line[p:]
-                    else:
-                        k += line[p:]
-                    p=len(line)
-                    continue
+            if Blank:
+                yield WinINF.event_blank,BlankLine,len(Blank),None,None,"".join(Blank)
+                Blank=[]
 
-                if ma.group(1) is None:
-                    if not fv:
-                        k+=ma.group(0)
-                        p = ma.span()[1]
-                    else:
-                        # if SeparatorRE == ValueRE:
-                        #     print("Warning: Line {0} Contains several equals characters.".format(lineNumber))
-                        #     f_error = True
-                        #     break
-
-                        v+=ma.group(0)
-                        p = ma.span()[1]
-                        if len(ma.group(0)) == 0 and p != len(line):
-                            p+=1
-                else:
-                    if not fv:
-                        if SeparatorRE != KeyRE and (ma.group(0)[-1] == '[' or ma.group(0)[-1] == ']'):
-                            print("Error: File [{0}] Line {1} Contains invalid characters '[' or ']'. [skiped]".format(os.path.basename(self.__FileName),lineNumber))
-                            f_error=True
-                            break
-
-                        if ma.group(0)[-1] != '"':
-                            k+=ma.group(0)[:-1]
-
-                            if ma.group(0)[-1] == "=":
-                                if ma.group(0).rstrip().lstrip() == "=" and EmptyRE.fullmatch(k) is not None:
-                                    print("Error: File [{0}] Line {1} Contains empty key. [skiped]".format(os.path.basename(self.__FileName),lineNumber))
-                                    f_error=True
-                                    break
-
-                                fv=True
-                                SeparatorRE=ValueRE
-                            else:
-                                c=line[ma.span()[1]-1:]
-                                p=len(line)
-                                continue
-                        else:
-                            k += ma.group(0)
-                            if f_open:
-                                # if ma.group(0).rstrip().lstrip() == '"':
-                                #     print("Error: Line {0} Contains empty key. [skiped]".format(lineNumber))
-                                #     f_error = True
-                                #     break
-
-                                f_open=False
-                                SeparatorRE=SepRE
-                            else:
-                                # if len(ma.group(0).rstrip().lstrip())>1:
-                                #     print("Error: Line {0} contains an invalid format. [skiped]".format(lineNumber))
-                                #     f_error = True
-                                #     break
-
-                                f_open = True
-                                SeparatorRE = KeyRE
-                        p = ma.span()[1]
-                    else:
-                        if ma.group(0)[-1] != '"':
-                            if f_open:
-                                print("Warning: File [{0}] Line {1} Contains an unclosed quote.".format(os.path.basename(self.__FileName),lineNumber))
+            yield Type,lineNumber,a,b,c,RawLine
 
-                            v+=ma.group(0)[:-1]
+        if Blank:
+            yield WinINF.event_blank,BlankLine,len(Blank),None,None,"".join(Blank)
 
-                            c = line[ma.span()[1] - 1:]
-                            p = len(line)
+    ## Function required for parser
+    #  splits line into key, value and comment
+    #  common lines without quotes are split with one search, quoted lines use __TokenizeQuoted
+    #  @param line (str) stripped line
+    #  @param lineNumber (int)
+    #  @return k,v,c,f_error
+    def __TokenizeLine(self,line,lineNumber):
+        if '"' in line:
+            return self.__TokenizeQuoted(line,lineNumber)
+
+        ms=self.__FastSepRE.search(line)
+        if ms is None:
+            return line,"","",False
+
+        i=ms.start()
+        s=line[i]
+        if s == ';':
+            return line[:i],"",line[i:],False
+
+        if s != '=':
+            self.__Diagnostics.Report(INFDiagnostics.invalid_characters,self.__FileName,lineNumber)
+            return "","","",True
+
+        k=line[:i]
+        if self.__EmptyRE.fullmatch(k) is not None:
+            self.__Diagnostics.Report(INFDiagnostics.empty_key,self.__FileName,lineNumber)
+            return "","","",True
+
+        v,sep,c=line[i+1:].partition(';')
+        if sep:
+            c=sep+c
+        if '=' in v:
+            v=v.replace('=','')
+
+        return k,v,c,False
 
-                            continue
-                        else:
-                            v += ma.group(0)
-                            if f_open:
-                                f_open=False
-                                SeparatorRE=ValueRE
-                            else:
-                                # if len(v) > 1:
-                                #     print("Warning: Line {0} contains several closing and opening quotes.".format(lineNumber))
-
-                                f_open = True
-                                SeparatorRE = KeyRE
-                        p = ma.span()[1]
-
-            if self.__Tail is not None and f_error == False:
-                if self.__Tail.GetName() == "":
-                    print("Error: File [{0}] Line {1} does not belong to any section. [skiped]".format(os.path.basename(self.__FileName),lineNumber))
-                    continue
+    ## Function required for parser
+    #  quote-aware state machine for lines containing '"'
+    #  @param line (str) stripped line
+    #  @param lineNumber (int)
+    #  @return k,v,c,f_error
+    def __TokenizeQuoted(self,line,lineNumber):
+        SeparatorRE = self.__SepRE
+        p=0
+        fv=False
+        f_open=False
+        f_error=False
+        k=""
+        v=""
+        c=""
+        while p != len(line):
+            ma = SeparatorRE.match(line,pos=p)
+            if ma is None:
+                if f_open:
+                    self.__Diagnostics.Report(INFDiagnostics.unclosed_quote,self.__FileName,lineNumber)
 
                 if v:
-                    self.__Tail.AddData(k,v,c,fraw=True)
+                    v += line[p:]
                 else:
-                    self.__Tail.AddData(k, None, c,fraw=True)
+                    k += line[p:]
+                p=len(line)
+                continue
+
+            if ma.group(1) is None:
+                if not fv:
+                    k+=ma.group(0)
+                    p = ma.span()[1]
+                else:
+                    # if SeparatorRE == self.__ValueRE:
+                    #     print("Warning: Line {0} Contains several equals characters.".format(lineNumber))
+                    #     f_error = True
+                    #     break
+
+                    v+=ma.group(0)
+                    p = ma.span()[1]
+                    if len(ma.group(0)) == 0 and p != len(line):
+                        p+=1
             else:
-                if self.__Tail is None and f_error == False:
-                    print("Error: File [{0}] Line {1} does not belong to any section. [skiped]".format(os.path.basename(self.__FileName),lineNumber))
+                if not fv:
+                    if SeparatorRE != self.__KeyRE and (ma.group(0)[-1] == '[' or ma.group(0)[-1] == ']'):
+                        self.__Diagnostics.Report(INFDiagnostics.invalid_characters,self.__FileName,lineNumber)
+                        f_error=True
+                        break
+
+                    if ma.group(0)[-1] != '"':
+                        k+=ma.group(0)[:-1]
+
+                        if ma.group(0)[-1] == "=":
+                            if ma.group(0).rstrip().lstrip() == "=" and self.__EmptyRE.fullmatch(k) is not None:
+                                self.__Diagnostics.Report(INFDiagnostics.empty_key,self.__FileName,lineNumber)
+                                f_error=True
+                                break
+
+                            fv=True
+                            SeparatorRE=self.__ValueRE
+                        else:
+                            c=line[ma.span()[1]-1:]
+                            p=len(line)
+                            continue
+                    else:
+                        k += ma.group(0)
+                        if f_open:
+                            # if ma.group(0).rstrip().lstrip() == '"':
+                            #     print("Error: Line {0} Contains empty key. [skiped]".format(lineNumber))
+                            #     f_error = True
+                            #     break
+
+                            f_open=False
+                            SeparatorRE=self.__SepRE
+                        else:
+                            # if len(ma.group(0).rstrip().lstrip())>1:
+                            #     print("Error: Line {0} contains an invalid format. [skiped]".format(lineNumber))
+                            #     f_error = True
+                            #     break
+
+                            f_open = True
+                            SeparatorRE = self.__KeyRE
+                    p = ma.span()[1]
+                else:
+                    if ma.group(0)[-1] != '"':
+                        if f_open:
+                            self.__Diagnostics.Report(INFDiagnostics.unclosed_quote,self.__FileName,lineNumber)
 
+                        v+=ma.group(0)[:-1]
 
+                        c = line[ma.span()[1] - 1:]
+                        p = len(line)
 
-        if self.__Tail is not None:
-            self.__Tail.SetValid()
-        f.close()
+                        continue
+                    else:
+                        v += ma.group(0)
+                        if f_open:
+                            f_open=False
+                            SeparatorRE=self.__ValueRE
+                        else:
+                            # if len(v) > 1:
+                            #     print("Warning: Line {0} contains several closing and opening quotes.".format(lineNumber))
+
+                            f_open = True
+                            SeparatorRE = self.__KeyRE
+                    p = ma.span()[1]
+
+        return k,v,c,f_error
+
+    ## Returns INF file content line by line (each line ends with "\n")
+    #  For files parsed with fKeepRaw lines before the first section are returned too (see GetText)
+    #  @return generator of str
+    def IterLines(self):
+        if self.__KeepRaw:
+            yield from io.StringIO(self.__Prefix)
+        Current=self.First()
+        while Current is not None:
+            yield from Current.IterLines()
+            Current=Current.Next()
+
+    ## Writes INF file content to an open text stream line by line
+    #  \code{.py}
+    #  with open("out.inf", "w", encoding="UTF-8") as f:
+    #      InfFile.SaveTo(f)
+    #  \endcode
+    #  @param f text file object
+    #  @return (bool)
+    def SaveTo(self, f):
+        if self.__Head is None:
+            self.__Diagnostics.Report(INFDiagnostics.nothing_to_save,self.__FileName)
+            return False
+
+        f.writelines(self.IterLines())
+        return True
 
     ## Saves INF file.
     #  If Name argument is None, then data saved to current file and overwrite information on it
@@ -1038,28 +2651,1434 @@ class WinINF:
     #  @param codec (str) for example can be "UTF-8"
     #  @return (bool)
     def Save(self, Name=None,codec=None):
-        if Name is not None:
-            self.__FileName=Name
+        if Name is None:
+            Name=self.__FileName
+        if codec is None:
+            codec=self.__FileCodec
 
-        if codec is not None:
+        if not self.__Frozen:
+            self.__FileName=Name
             self.__FileCodec=codec
 
         if self.__Head is None:
-            print("Error: empty inf file, nothing to save")
+            self.__Diagnostics.Report(INFDiagnostics.nothing_to_save,Name)
             return False
 
-        f=open(self.__FileName,"w",encoding=self.__FileCodec)
+        with open(Name,"w",encoding=codec) as f:
+            return self.SaveTo(f)
+
+    ## Saves INF file in an executor without blocking the event loop (see Save)
+    #  The file must not be changed until saving is completed
+    #  \code{.py}
+    #  await InfFile.SaveAsync("./new.inf", "utf-8")
+    #  \endcode
+    #  @param Name (str)
+    #  @param codec (str) for example can be "UTF-8"
+    #  @param executor (concurrent.futures.ThreadPoolExecutor) None - default executor of the event loop
+    #  @return (bool)
+    async def SaveAsync(self,Name=None,codec=None,executor=None):
+        Loop=asyncio.get_running_loop()
+        return await Loop.run_in_executor(executor,self.Save,Name,codec)
+
+
+## Class INFDiff - result of WinINF.Diff
+#  Values of changed keys are lists, because a key can be repeated in the section.
+#  Lines of single line sections are keys with empty value.
+#  \code{.py}
+#  Changes = OldFile.Diff(NewFile)
+#  for Name, Changes in Changes.ChangedSections.items():
+#      print(Name, Changes["added"], Changes["removed"], Changes["changed"])
+#  \endcode
+#
+class INFDiff:
+    ## Default constructor
+    #  @param OldName (str) old file name
+    #  @param NewName (str) new file name
+    def __init__(self,OldName="",NewName=""):
+        self.OldName=OldName
+        self.NewName=NewName
+        self.AddedSections=[]
+        self.RemovedSections=[]
+        ## section name -> {"added": {key: [values]}, "removed": {key: [values]}, "changed": {key: {"old": [values], "new": [values]}}}
+        self.ChangedSections={}
+
+    ## Checks if files are different
+    #  @return bool
+    def __bool__(self):
+        return bool(self.AddedSections or self.RemovedSections or self.ChangedSections)
+
+    ## Returns changes as dict that can be saved as JSON
+    #  @return dict
+    def ToDict(self):
+        return {"old":self.OldName,"new":self.NewName,"added_sections":list(self.AddedSections),
+                "removed_sections":list(self.RemovedSections),"changed_sections":self.ChangedSections}
+
+    ## Creates diff from dict returned by ToDict
+    #  @param Data (dict)
+    #  @return INFDiff
+    @staticmethod
+    def FromDict(Data):
+        Returner=INFDiff(Data.get("old",""),Data.get("new",""))
+        Returner.AddedSections=list(Data.get("added_sections",()))
+        Returner.RemovedSections=list(Data.get("removed_sections",()))
+        Returner.ChangedSections=dict(Data.get("changed_sections",{}))
+        return Returner
+
+    ## Returns changes in unified diff like format
+    #  @return str
+    def Unified(self):
+        Lines=["--- {0}".format(self.OldName),"+++ {0}".format(self.NewName)]
+
+        for Name in self.RemovedSections:
+            Lines.append("-[{0}]".format(Name))
+        for Name in self.AddedSections:
+            Lines.append("+[{0}]".format(Name))
+
+        def Row(Sign,k,v):
+            return "{0}{1} = {2}".format(Sign,k,v) if v else Sign+k
+
+        for Name,Changes in self.ChangedSections.items():
+            Lines.append("@@ [{0}] @@".format(Name))
+            for k,Values in Changes["removed"].items():
+                Lines.extend(Row('-',k,v) for v in Values)
+            for k,Values in Changes["changed"].items():
+                Lines.extend(Row('-',k,v) for v in Values["old"])
+                Lines.extend(Row('+',k,v) for v in Values["new"])
+            for k,Values in Changes["added"].items():
+                Lines.extend(Row('+',k,v) for v in Values)
+        return "\n".join(Lines)+"\n"
+
+    def __str__(self):
+        return self.Unified()
+
+    ## Compares content of sections with the same name
+    #  @param Old list of INFsection
+    #  @param New list of INFsection
+    #  @return dict {"added": {}, "removed": {}, "changed": {}}, empty dict if data is the same
+    @staticmethod
+    def CompareSections(Old,New):
+        OldRows=INFDiff.__GetRows(Old)
+        NewRows=INFDiff.__GetRows(New)
+
+        Added={}
+        Removed={}
+        Changed={}
+        for Key,(k,Values) in OldRows.items():
+            NewRow=NewRows.get(Key)
+            if NewRow is None:
+                Removed[k]=Values
+            elif NewRow[1] != Values:
+                Changed[k]={"old":Values,"new":NewRow[1]}
+
+        for Key,(k,Values) in NewRows.items():
+            if Key not in OldRows:
+                Added[k]=Values
+
+        if not (Added or Removed or Changed):
+            return {}
+        return {"added":Added,"removed":Removed,"changed":Changed}
+
+    ## Function required for CompareSections
+    #  groups values of sections by key
+    #  @param Sections list of INFsection
+    #  @return dict casefolded key -> (key, list of values)
+    @staticmethod
+    def __GetRows(Sections):
+        Rows={}
+        for Section in Sections:
+            for k,v,c in Section:
+                if not k:
+                    continue
+                k=k.strip()
+                Row=Rows.get(k.casefold())
+                if Row is None:
+                    Row=Rows[k.casefold()]=(k,[])
+                Row[1].append(v.strip() if v else "")
+        return Rows
+
+
+## Class INFGraph - references between sections of INF file
+#  Edges are created by directives of install sections (CopyFiles, AddReg, DelReg, AddService, Needs...),
+#  by [Manufacturer] entries to models sections, by models entries to install sections and from install
+#  sections to their .Services, .HW, .CoInstallers... sections. A reference to X is resolved to X and its
+#  decorated variants (X.NT, X.NTamd64...). Section names are case-insensitive, sections with the same
+#  name are merged. Include directives are references to files, they are returned by GetIncludes.
+#  Use WinINF.GetGraph to get the graph, it is updated after changes of the file.
+#
+class INFGraph:
+    ## Directives with lists of sections
+    ListDirectives=("copyfiles","addreg","delreg","renfiles","delfiles","updateinis","updateinifields","ini2reg",
+                    "bitreg","registerdlls","unregisterdlls","profileitems","addproperty","delproperty","needs")
+
+    ## Directives with sections in some fields: directive -> field indexes
+    FieldDirectives={"addservice":(2,3),"addinterface":(2,)}
+
+    ## Sections referenced by install section name with suffix
+    Suffixes=(".services",".hw",".coinstallers",".interfaces",".logconfig",".factdef",".wmi",".events")
+
+    ## Sections that are used by Windows without references
+    Roots=("version","strings","manufacturer","destinationdirs","sourcedisksnames","sourcedisksfiles",
+           "defaultinstall","defaultuninstall","classinstall32","controlflags","signatureattributes")
+
+    ## Default constructor
+    #  @param Inf (WinINF)
+    def __init__(self,Inf):
+        self.__Inf=Inf
+        self.__Cache={}
+        self.__State=None
+        self.Update()
+
+    ## Updates graph after changes of the file, only changed sections are scanned again
+    def Update(self):
+        Sections=list(self.__Inf)
+        State=[(Section,Section.GetRevision()) for Section in Sections]
+        if self.__State is not None and len(State) == len(self.__State) and \
+           all(a is b and r == q for (a,r),(b,q) in zip(State,self.__State)):
+            return
+
+        Cache={}
+        for Section,Revision in State:
+            Entry=self.__Cache.get(id(Section))
+            if Entry is None or Entry[0] is not Section or Entry[1] != Revision:
+                Entry=(Section,Revision)+INFGraph.__GetEdges(Section)
+            Cache[id(Section)]=Entry
+        self.__Cache=Cache
+        self.__State=State
+        self.__Build(Sections)
+
+    ## Returns section names
+    #  @return list
+    def GetSections(self):
+        return list(self.__Names.values())
+
+    ## Returns references of the section
+    #  @param Name (str) section name
+    #  @return list of (directive, section name), section name is as written if the section is not present
+    def GetReferences(self,Name):
+        return [(Directive,self.__Names.get(Target) or self.__Missing[Target]) for Directive,Target in self.__Forward.get(Name.casefold(),())]
+
+    ## Returns sections that reference the section
+    #  @param Name (str) section name
+    #  @return list of (section name, directive)
+    def GetReferencedBy(self,Name):
+        return [(self.__Names[Source],Directive) for Source,Directive in self.__Reverse.get(Name.casefold(),())]
+
+    ## Returns references to sections that are not present in the file.
+    #  Needs references are not checked if the file has Include directives
+    #  @return list of (section name, directive, referenced name)
+    def GetDangling(self):
+        return list(self.__Dangling)
+
+    ## Returns sections that can't be reached from sections used by Windows directly (see Roots)
+    #  @return list of section names
+    def GetUnreachable(self):
+        Reached=set()
+        for Key in self.__Names:
+            if Key in Reached:
+                continue
+            if any(Key == r or Key.startswith(r+'.') for r in INFGraph.Roots):
+                Reached.update(self.__Walk(Key))
+        return [Name for Key,Name in self.__Names.items() if Key not in Reached]
+
+    ## Returns all sections used by the section directly or indirectly, the section itself
+    #  (or its decorated variants if the section is not present) is the first item
+    #  @param Name (str) section name, for example install section
+    #  @return list of section names
+    def GetClosure(self,Name):
+        Key=Name.casefold()
+        Returner=self.__Closures.get(Key)
+        if Returner is None:
+            Returner=self.__Closures[Key]=[self.__Names[k] for k in self.__Walk(Key)]
+        return list(Returner)
+
+    ## Returns file names of Include directives
+    #  @return list of str
+    def GetIncludes(self):
+        return list(self.__Includes)
+
+    ## Function required for graph
+    #  @param Key (str) casefolded section name
+    #  @return list of casefolded names of reached sections
+    def __Walk(self,Key):
+        Returner=[Key] if Key in self.__Names else list(self.__Decorated.get(Key,()))
+        Seen=set(Returner)
+        for Current in Returner:
+            for Directive,Target in self.__Forward.get(Current,()):
+                if Target in self.__Names and Target not in Seen:
+                    Seen.add(Target)
+                    Returner.append(Target)
+        return Returner
+
+    ## Function required for graph
+    #  builds forward and reverse edges from the edges of sections
+    #  @param Sections list of INFsection
+    def __Build(self,Sections):
+        Names={}
+        Edges={}
+        Models={}
+        Includes=[]
+        for Section in Sections:
+            Name=Section.GetName()
+            if not Name.strip():
+                continue
+            Key=Name.casefold()
+            Names.setdefault(Key,Name)
+            Section,Revision,SectionEdges,ModelEdges,SectionIncludes=self.__Cache[id(Section)]
+            Edges.setdefault(Key,[]).extend(SectionEdges)
+            Models.setdefault(Key,[]).extend(ModelEdges)
+            Includes.extend(SectionIncludes)
+
+        Decorated={}
+        for Key in Names:
+            i=Key.find(".nt")
+            if i > 0 and '.' not in Key[i+1:]:
+                Decorated.setdefault(Key[:i],[]).append(Key)
+
+        ModelSections=set()
+        for Directive,Target in Edges.get("manufacturer",()):
+            Target=Target.casefold()
+            ModelSections.add(Target)
+            ModelSections.update(Decorated.get(Target,()))
+
+        Forward={}
+        Reverse={}
+        Dangling=[]
+        Missing={}
+        for Key in Names:
+            Targets=list(Edges.get(Key,()))
+            if Key in ModelSections:
+                Targets.extend(Models.get(Key,()))
+
+            Resolved={}
+            for Directive,Written in Targets:
+                Target=Written.casefold()
+                if Target in Names:
+                    Resolved[(Directive,Target)]=None
+                elif Target in Decorated:
+                    Resolved.update(((Directive,d),None) for d in Decorated[Target])
+                else:
+                    Missing.setdefault(Target,Written)
+                    if (Directive,Target) not in Resolved and (Directive != "needs" or not Includes):
+                        Dangling.append((Names[Key],Directive,Written))
+                    Resolved[(Directive,Target)]=None
+
+            for Suffix in INFGraph.Suffixes:
+                if Key+Suffix in Names:
+                    Resolved[(Suffix[1:],Key+Suffix)]=None
+
+            Forward[Key]=list(Resolved)
+            for Directive,Target in Resolved:
+                if Target in Names:
+                    Reverse.setdefault(Target,[]).append((Key,Directive))
+
+        self.__Names=Names
+        self.__Missing=Missing
+        self.__Decorated=Decorated
+        self.__Forward=Forward
+        self.__Reverse=Reverse
+        self.__Dangling=Dangling
+        self.__Includes=Includes
+        self.__Closures={}
+
+    ## Function required for graph
+    #  finds references in the section
+    #  @param Section (INFsection)
+    #  @return (list of (directive, section name), list of model edges, list of included files)
+    @staticmethod
+    def __GetEdges(Section):
+        Edges=[]
+        ModelEdges=[]
+        Includes=[]
+        fManufacturer=Section.GetName().strip().casefold() == "manufacturer"
+
+        for Index,(k,v,c) in enumerate(Section):
+            if not k:
+                continue
+
+            if fManufacturer:
+                # without a value the key is the models section name (see INFHardwareIndex.GetIDs)
+                Fields=Section.GetFields(Index) if v else (k.strip().strip('%'),)
+                Base=Fields[0]
+                if Base:
+                    Edges.append(("models",Base))
+                    Edges.extend(("models",Base+'.'+d) for d in Fields[1:] if d)
+                continue
+            if not v:
+                continue
+
+            Directive=k.strip().casefold()
+            Fields=Section.GetFields(Index)
+            if Directive in INFGraph.ListDirectives:
+                Edges.extend((Directive,f) for f in Fields if f and f[0] != '@')
+            elif Directive in INFGraph.FieldDirectives:
+                Edges.extend((Directive,Fields[i]) for i in INFGraph.FieldDirectives[Directive] if i < len(Fields) and Fields[i])
+            elif Directive == "include":
+                Includes.extend(f for f in Fields if f)
+            elif Fields[0]:
+                ModelEdges.append(("install",Fields[0]))
+        return Edges,ModelEdges,Includes
+
+
+## Class INFCache - on-disk cache of parsed INF files
+#  Parsed WinINF objects are stored in the cache directory and reused while path, size and
+#  modification time (and optionally content hash) of the file are the same.
+#  Least recently used entries are removed when the cache is bigger than MaxSize.
+#  Cache entries are pickle files, so the cache directory must not be writable by others.
+#  \code{.py}
+#  Cache = INFCache("./.infcache", MaxSize=256*1024*1024)
+#  InfFile = Cache.ParseFile("./Intel.inf")
+#  \endcode
+#
+class INFCache:
+    ## Cache format version, entries with other version are ignored
+    Version=10
+
+    ## Default constructor
+    #  @param Path (str) cache directory
+    #  @param MaxSize (int) maximum cache size in bytes
+    #  @param fHash (bool) checks content hash of the file in addition to size and modification time
+    def __init__(self,Path,MaxSize=64*1024*1024,fHash=False):
+        self.__Path=Path
+        self.__MaxSize=MaxSize
+        self.__fHash=fHash
+        os.makedirs(self.__Path,exist_ok=True)
+
+        self.__Size=0
+        for Entry in os.scandir(self.__Path):
+            if Entry.name.endswith(".cache"):
+                self.__Size+=Entry.stat().st_size
+
+    ## Returns cache size in bytes
+    #  @return int
+    def GetSize(self):
+        return self.__Size
+
+    ## Opens INF file from cache, or parses it and stores it to the cache (see WinINF.ParseFile)
+    #  @param Name (str)
+    #  @param codec (str) for example can be "UTF-8"
+    #  @return WinINF
+    def ParseFile(self,Name,codec=None):
+        EntryName=self.__EntryName(Name)
+        Key=self.__Key(Name,codec)
+
+        try:
+            with open(EntryName,"rb") as f:
+                EntryKey,Inf=pickle.load(f)
+            if EntryKey == Key:
+                os.utime(EntryName)
+                Inf.SetFileName(Name)
+                return Inf
+        except (OSError,EOFError,pickle.UnpicklingError,AttributeError,ValueError,TypeError):
+            pass
+
+        Inf=WinINF()
+        Inf.ParseFile(Name,codec)
+        self.__Store(EntryName,Key,Inf)
+        return Inf
+
+    ## Removes file from cache, if Name is None the whole cache is cleared
+    #  @param Name (str)
+    def Invalidate(self,Name=None):
+        if Name is not None:
+            self.__Remove(self.__EntryName(Name))
+            return
+
+        for Entry in os.scandir(self.__Path):
+            if Entry.name.endswith(".cache"):
+                self.__Remove(Entry.path)
+
+    ## Function required for cache
+    #  @param Name (str) INF file name
+    #  @return str cache entry file name
+    def __EntryName(self,Name):
+        Digest=hashlib.sha1(os.path.abspath(Name).encode("utf-8","surrogatepass")).hexdigest()
+        return os.path.join(self.__Path,Digest+".cache")
+
+    ## Function required for cache
+    #  @param Name (str) INF file name
+    #  @param codec (str)
+    #  @return tuple that identifies file content
+    def __Key(self,Name,codec):
+        st=os.stat(Name)
+        Digest=None
+        if self.__fHash:
+            with open(Name,"rb") as f:
+                Digest=hashlib.sha256(f.read()).hexdigest()
+        return (INFCache.Version,os.path.abspath(Name),codec,st.st_size,st.st_mtime_ns,Digest)
+
+    ## Function required for cache
+    #  writes cache entry and removes least recently used entries
+    def __Store(self,EntryName,Key,Inf):
+        self.__Remove(EntryName)
+
+        TmpName="{0}.{1}.tmp".format(EntryName,os.getpid())
+        try:
+            with open(TmpName,"wb") as f:
+                pickle.dump((Key,Inf),f,pickle.HIGHEST_PROTOCOL)
+            os.replace(TmpName,EntryName)
+            self.__Size+=os.stat(EntryName).st_size
+        except OSError:
+            try:
+                os.remove(TmpName)
+            except OSError:
+                pass
+            return
+
+        if self.__Size > self.__MaxSize:
+            Entries=[e for e in os.scandir(self.__Path) if e.name.endswith(".cache")]
+            Entries.sort(key=lambda e: e.stat().st_mtime_ns)
+            for Entry in Entries:
+                if self.__Size <= self.__MaxSize:
+                    break
+                self.__Remove(Entry.path)
+
+    ## Function required for cache
+    #  removes cache entry
+    def __Remove(self,EntryName):
+        try:
+            Size=os.stat(EntryName).st_size
+            os.remove(EntryName)
+            self.__Size-=Size
+        except OSError:
+            pass
+
+
+## Class INFHardwareIndex - index of hardware and compatible IDs over many INF files
+#  Walks [Manufacturer] entries to their models sections (including decorated sections like
+#  Intel.Mfg.NTamd64) and maps every ID to (file, models section, install section, description).
+#  IDs are case-insensitive.
+#  \code{.py}
+#  Index = INFHardwareIndex()
+#  Index.AddFile(InfFile)
+#  for File, Models, Install, Description in Index.Find("PCI\\VEN_8086&DEV_3577&SUBSYS_00C81028"):
+#      print(File, Models, Install, Description)
+#  \endcode
+#
+class INFHardwareIndex:
+    ## Index format version
+    Version=1
 
-        for Current in self:
-            f.write(Current.Save())
+    ## Default constructor
+    #  @param Infs iterable of WinINF
+    def __init__(self,Infs=None):
+        self.__IDs={}
+        self.__Files={}
+        self.__Sorted=None
+
+        if Infs is not None:
+            for Inf in Infs:
+                self.AddFile(Inf)
+
+    ## Returns indexed file names
+    #  @return list
+    def Files(self):
+        return list(self.__Files.keys())
+
+    ## Returns number of indexed IDs
+    #  @return int
+    def Count(self):
+        return len(self.__IDs)
 
-        f.close()
+    ## Adds all IDs of the INF file, IDs of the file with the same name are replaced
+    #  @param Inf (WinINF)
+    #  @param Name (str) if None, file name of Inf is used
+    def AddFile(self,Inf,Name=None):
+        if Name is None:
+            Name=Inf.GetFileName()
+
+        self.__AddRows(Name,INFHardwareIndex.GetIDs(Inf))
+
+    ## Removes all IDs of the file
+    #  @param Name (str)
+    def RemoveFile(self,Name):
+        Rows=self.__Files.pop(Name,None)
+        if Rows is None:
+            return
+
+        for HardwareID,Models,Install,Description in Rows:
+            Key=HardwareID.casefold()
+            Entries=self.__IDs.get(Key)
+            if Entries is None:
+                continue
+            Entries[:]=[e for e in Entries if e[0] != Name]
+            if not Entries:
+                del self.__IDs[Key]
+                self.__Sorted=None
+
+    ## Returns entries for hardware or compatible ID
+    #  @param HardwareID (str)
+    #  @return list of (file, models section, install section, description)
+    def Find(self,HardwareID):
+        return list(self.__IDs.get(HardwareID.casefold(),()))
+
+    ## Returns entries for all IDs starting with Prefix, IDs are returned casefolded
+    #  \code{.py}
+    #  for HardwareID, Entry in Index.FindPrefix("PCI\\VEN_8086&DEV_2562"):
+    #      print(HardwareID, Entry)
+    #  \endcode
+    #  @param Prefix (str)
+    #  @return generator of (str, (file, models section, install section, description))
+    def FindPrefix(self,Prefix):
+        if self.__Sorted is None:
+            self.__Sorted=sorted(self.__IDs.keys())
+
+        Prefix=Prefix.casefold()
+        for i in range(bisect_left(self.__Sorted,Prefix),len(self.__Sorted)):
+            Key=self.__Sorted[i]
+            if not Key.startswith(Prefix):
+                break
+            for Entry in self.__IDs[Key]:
+                yield Key,Entry
+
+    ## Saves index to JSON file
+    #  @param Name (str)
+    def Save(self,Name):
+        with open(Name,"w",encoding="utf-8") as f:
+            json.dump({"version":INFHardwareIndex.Version,"files":self.__Files},f)
+
+    ## Loads index from JSON file created by Save
+    #  @param Name (str)
+    #  @param Diagnostics (INFDiagnostics) if None, messages are printed
+    #  @return (bool)
+    def Load(self,Name,Diagnostics=None):
+        with open(Name,encoding="utf-8") as f:
+            Data=json.load(f)
+
+        if Data.get("version") != INFHardwareIndex.Version:
+            if Diagnostics is None:
+                Diagnostics=INFDiagnostics.Default
+            Diagnostics.Report(INFDiagnostics.unsupported_version,Name,None,"index",Data.get("version"))
+            return False
+
+        self.__IDs={}
+        self.__Files={}
+        self.__Sorted=None
+        for File,Rows in Data["files"].items():
+            self.__AddRows(File,[tuple(r) for r in Rows])
         return True
 
+    ## Function required for index
+    #  @param Name (str) file name
+    #  @param Rows list of (id, models section, install section, description)
+    def __AddRows(self,Name,Rows):
+        self.RemoveFile(Name)
+        self.__Files[Name]=Rows
+
+        for HardwareID,Models,Install,Description in Rows:
+            Key=HardwareID.casefold()
+            Entries=self.__IDs.get(Key)
+            if Entries is None:
+                Entries=self.__IDs[Key]=[]
+                self.__Sorted=None
+            Entries.append((Name,Models,Install,Description))
+
+    ## Returns hardware and compatible IDs from models sections of the INF file
+    #  @param Inf (WinINF)
+    #  @return list of (id, models section, install section, description)
+    @staticmethod
+    def GetIDs(Inf):
+        Manufacturers=[]
+        for Section in Inf.GetSections("manufacturer"):
+            for Index,(k,v,c) in enumerate(Section):
+                if k:
+                    Manufacturers.append(Section.GetFields(Index) if v else (k.strip().strip('%'),))
+
+        Rows=[]
+        for Fields in Manufacturers:
+            Base=Fields[0]
+            if not Base:
+                continue
 
+            ModelsNames=[Base]+[Base+'.'+d for d in Fields[1:] if d]
+            for ModelsName in ModelsNames:
+                for Section in Inf.GetSections(ModelsName):
+                    Name=Section.GetName()
+                    for Index,(Description,Value,Comment) in enumerate(Section):
+                        if not Description or not Value:
+                            continue
 
+                        Fields=Section.GetFields(Index)
+                        Description=Inf.Resolve(Description.strip()).strip('"')
+                        for HardwareID in Fields[1:]:
+                            if HardwareID:
+                                Rows.append((HardwareID,Name,Fields[0],Description))
+        return Rows
+
+
+## Class INFColumns - rows of many INF files stored in columns
+#  Every row of every section is stored as (file, section, row, key, value, comment) in six
+#  uint32 arrays. File names and all strings are dictionary encoded: columns contain codes,
+#  code 0 is the empty string. Saved files can be loaded with mmap without copying the columns.
+#  \code{.py}
+#  Columns = INFColumns()
+#  for Name, InfFile, Messages in WinINF.ParseDirectory("./DriverStore", workers=8):
+#      if not isinstance(InfFile, Exception):
+#          Columns.AddFile(InfFile)
+#  Columns.Save("corpus.infcol")
+#
+#  Columns = INFColumns.Load("corpus.infcol")
+#  Keys = Columns.Column("key")                 # memoryview of uint32
+#  Code = Columns.GetCode("CopyFiles")
+#  print(sum(1 for k in Keys if k == Code))
+#  \endcode
+#
+class INFColumns:
+    ## Binary format version
+    Version=1
 
+    ## Column names
+    Names=("file","section","row","key","value","comment")
 
+    __Magic=b"INFCOL\0\0"
+    __Header=struct.Struct("<8sIIII")
+    __Offset=struct.Struct("<I")
 
+    ## Default constructor
+    def __init__(self):
+        self.__Columns={Name:array.array("I") for Name in INFColumns.Names}
+        self.__Files=[]
+        self.__FileCodes={}
+        self.__Strings=[""]
+        self.__StringCodes={"":0}
+        self.__Map=None
+        self.__Views=[]
+        self.__Tables=None
+
+    ## Returns number of rows
+    #  @return int
+    def Count(self):
+        return len(self.__Columns["row"])
+
+    ## Returns number of files
+    #  @return int
+    def FileCount(self):
+        return len(self.__Files) if self.__Tables is None else len(self.__Tables[0][0])-1
+
+    ## Returns number of distinct strings
+    #  @return int
+    def StringCount(self):
+        return len(self.__Strings) if self.__Tables is None else len(self.__Tables[1][0])-1
+
+    ## Returns column by name (see Names), array of uint32 or memoryview for loaded files
+    #  @param Name (str)
+    #  @return array.array or memoryview
+    def Column(self,Name):
+        return self.__Columns[Name]
+
+    ## Returns columns as NumPy arrays without copying, requires numpy
+    #  @return dict name -> numpy.ndarray
+    def ToNumpy(self):
+        import numpy
+        return {Name:numpy.frombuffer(Column,dtype=numpy.uint32) for Name,Column in self.__Columns.items()}
+
+    ## Returns string by code
+    #  @param Code (int)
+    #  @return str
+    def GetString(self,Code):
+        if self.__Tables is None:
+            return self.__Strings[Code]
+        return self.__GetTableString(1,Code)
 
+    ## Returns file name by code
+    #  @param Code (int)
+    #  @return str
+    def GetFileName(self,Code):
+        if self.__Tables is None:
+            return self.__Files[Code]
+        return self.__GetTableString(0,Code)
+
+    ## Returns code of the string
+    #  For loaded files the string table is decoded on first call, columns stay mapped
+    #  @param String (str)
+    #  @return int, -1 if the string is not present
+    def GetCode(self,String):
+        if self.__StringCodes is None:
+            self.__StringCodes=self.__GetTableCodes(1)
+        return self.__StringCodes.get(String,-1)
+
+    ## Returns code of the file name
+    #  @param Name (str)
+    #  @return int, -1 if the file is not present
+    def GetFileCode(self,Name):
+        if self.__FileCodes is None:
+            self.__FileCodes=self.__GetTableCodes(0)
+        return self.__FileCodes.get(Name,-1)
+
+    ## Lets go through decoded rows
+    #  @param Start (int) first row
+    #  @param End (int) end row, None - all rows
+    #  @return generator of (file, section, row, key, value, comment)
+    def Rows(self,Start=0,End=None):
+        Files,Sections,Rows,Keys,Values,Comments=(self.__Columns[ColumnName] for ColumnName in INFColumns.Names)
+        if End is None:
+            End=len(Rows)
+
+        GetString=self.GetString
+        for i in range(Start,End):
+            yield (self.GetFileName(Files[i]),GetString(Sections[i]),Rows[i],
+                   GetString(Keys[i]),GetString(Values[i]),GetString(Comments[i]))
+
+    ## Adds all rows of the INF file
+    #  @param Inf (WinINF)
+    #  @param Name (str) if None, file name of Inf is used
+    def AddFile(self,Inf,Name=None):
+        self.__Unpack()
+        if Name is None:
+            Name=Inf.GetFileName()
+
+        FileCode=self.__FileCodes.get(Name)
+        if FileCode is None:
+            FileCode=self.__FileCodes[Name]=len(self.__Files)
+            self.__Files.append(Name)
+
+        Strings=self.__Strings
+        StringCodes=self.__StringCodes
+
+        def Encode(String):
+            if not String:
+                return 0
+            Code=StringCodes.get(String)
+            if Code is None:
+                Code=StringCodes[String]=len(Strings)
+                Strings.append(String)
+            return Code
+
+        Files,Sections,Rows,Keys,Values,Comments=(self.__Columns[ColumnName] for ColumnName in INFColumns.Names)
+        for Section in Inf:
+            Size=Section.GetSize()
+            if not Size:
+                continue
+
+            SectionCode=Encode(Section.GetName())
+            Files.extend(itertools.repeat(FileCode,Size))
+            Sections.extend(itertools.repeat(SectionCode,Size))
+            Rows.extend(range(Size))
+            for k,v,c in Section:
+                Keys.append(Encode(k))
+                Values.append(Encode(v))
+                Comments.append(Encode(c))
 
+    ## Saves columns to binary file
+    #  @param Name (str)
+    def Save(self,Name):
+        Tables=[self.__PackTable(i) for i in range(2)]
+        with open(Name,"wb") as f:
+            f.write(INFColumns.__Header.pack(INFColumns.__Magic,INFColumns.Version,self.Count(),
+                                             len(Tables[0][0])-1,len(Tables[1][0])-1))
+            for Offsets,Blob in Tables:
+                INFColumns.__WriteArray(f,Offsets)
+                f.write(Blob)
+                f.write(b"\0"*(-len(Blob)%4))
+            for Column in self.__Columns.values():
+                INFColumns.__WriteArray(f,Column)
+
+    ## Loads columns from file created by Save
+    #  Columns and strings are not copied from the mapped file, strings are decoded on first access.
+    #  The file must not be changed while the columns are used.
+    #  @param Name (str)
+    #  @param fMap (bool) if False the file is read to memory instead of mmap
+    #  @param Diagnostics (INFDiagnostics) if None, messages are printed
+    #  @return INFColumns or None if the file has unsupported format
+    @staticmethod
+    def Load(Name,fMap=True,Diagnostics=None):
+        if Diagnostics is None:
+            Diagnostics=INFDiagnostics.Default
+
+        with open(Name,"rb") as f:
+            if os.fstat(f.fileno()).st_size < INFColumns.__Header.size:
+                Diagnostics.Report(INFDiagnostics.invalid_format,Name,None,"columns")
+                return None
+            if fMap:
+                Data=mmap.mmap(f.fileno(),0,access=mmap.ACCESS_READ)
+            else:
+                Data=f.read()
+
+        Magic,Version,RowCount,FileCount,StringCount=INFColumns.__Header.unpack_from(Data)
+        if Magic != INFColumns.__Magic:
+            Error=(INFDiagnostics.invalid_format,)
+        elif Version != INFColumns.Version:
+            Error=(INFDiagnostics.unsupported_version,Version)
+        elif INFColumns.__GetSize(Data,RowCount,FileCount,StringCount) != len(Data):
+            Error=(INFDiagnostics.invalid_format,)
+        else:
+            Error=None
+        if Error is not None:
+            if fMap:
+                Data.close()
+            Diagnostics.Report(Error[0],Name,None,"columns",*Error[1:])
+            return None
+
+        View=memoryview(Data)
+        Views=[View]
+        Position=INFColumns.__Header.size
+        Tables=[]
+        for Count in (FileCount,StringCount):
+            Offsets=INFColumns.__ReadArray(View,Position,Count+1)
+            Position+=(Count+1)*4
+            Tables.append((Offsets,View[Position:Position+Offsets[-1]],{}))
+            Views.extend(Tables[-1][:2])
+            Position+=Offsets[-1]+(-Offsets[-1]%4)
+
+        Returner=INFColumns()
+        for ColumnName in INFColumns.Names:
+            Returner.__Columns[ColumnName]=INFColumns.__ReadArray(View,Position,RowCount)
+            Views.append(Returner.__Columns[ColumnName])
+            Position+=RowCount*4
+
+        Returner.__Files=None
+        Returner.__FileCodes=None
+        Returner.__Strings=None
+        Returner.__StringCodes=None
+        Returner.__Tables=Tables
+        Returner.__Map=Data if fMap else None
+        Returner.__Views=[v for v in Views if isinstance(v,memoryview)]
+        return Returner
+
+    ## Releases mapped file, columns and strings are copied to memory before.
+    #  Columns returned by Column before are released and can't be used after Close.
+    #  If buffers made from them are still used (slices, NumPy arrays), the file is closed when they are deleted
+    def Close(self):
+        self.__Unpack()
+        for View in self.__Views:
+            try:
+                View.release()
+            except BufferError:
+                pass
+        self.__Views=[]
+        if self.__Map is not None:
+            try:
+                self.__Map.close()
+            except BufferError:
+                pass
+            self.__Map=None
+
+    ## Function required for Load
+    #  returns expected file size from the header counts and table offsets
+    #  @param Data (bytes or mmap) file content
+    #  @param RowCount (int)
+    #  @param FileCount (int)
+    #  @param StringCount (int)
+    #  @return int, bigger than the file if the file is truncated
+    @staticmethod
+    def __GetSize(Data,RowCount,FileCount,StringCount):
+        Position=INFColumns.__Header.size
+        for Count in (FileCount,StringCount):
+            Position+=(Count+1)*4
+            if Position > len(Data):
+                return Position
+            BlobSize,=INFColumns.__Offset.unpack_from(Data,Position-4)
+            Position+=BlobSize+(-BlobSize%4)
+        return Position+RowCount*4*len(INFColumns.Names)
+
+    ## Function required for Load
+    #  decodes string of the mapped table
+    #  @param Table (int) 0 - files, 1 - strings
+    #  @param Code (int)
+    #  @return str
+    def __GetTableString(self,Table,Code):
+        Offsets,Blob,Cache=self.__Tables[Table]
+        String=Cache.get(Code)
+        if String is None:
+            String=Cache[Code]=str(Blob[Offsets[Code]:Offsets[Code+1]],"utf-8","surrogatepass")
+        return String
+
+    ## Function required for GetCode and GetFileCode after Load
+    #  returns codes of all strings of the mapped table, columns are not copied
+    #  @param Table (int) 0 - files, 1 - strings
+    #  @return dict str -> code
+    def __GetTableCodes(self,Table):
+        return {self.__GetTableString(Table,Code):Code for Code in range(len(self.__Tables[Table][0])-1)}
+
+    ## Function required for changes after Load
+    #  copies mapped columns and tables to memory
+    def __Unpack(self):
+        if self.__Tables is None:
+            return
+
+        Files=[self.__GetTableString(0,i) for i in range(len(self.__Tables[0][0])-1)]
+        Strings=[self.__GetTableString(1,i) for i in range(len(self.__Tables[1][0])-1)]
+        self.__Columns={Name:array.array("I",Column) for Name,Column in self.__Columns.items()}
+        self.__Files=Files
+        self.__FileCodes={Name:Code for Code,Name in enumerate(Files)}
+        self.__Strings=Strings
+        self.__StringCodes={String:Code for Code,String in enumerate(Strings)}
+        self.__Tables=None
+
+    ## Function required for Save
+    #  @param Table (int) 0 - files, 1 - strings
+    #  @return (array of offsets, bytes)
+    def __PackTable(self,Table):
+        if self.__Tables is not None:
+            Offsets,Blob,Cache=self.__Tables[Table]
+            return array.array("I",Offsets),bytes(Blob)
+
+        Offsets=array.array("I",[0])
+        Parts=[]
+        Size=0
+        for String in (self.__Files if Table == 0 else self.__Strings):
+            Part=String.encode("utf-8","surrogatepass")
+            Parts.append(Part)
+            Size+=len(Part)
+            Offsets.append(Size)
+        return Offsets,b"".join(Parts)
+
+    ## Function required for Save
+    #  writes uint32 array in little endian order
+    @staticmethod
+    def __WriteArray(f,Values):
+        if sys.byteorder != "little":
+            Values=array.array("I",Values)
+            Values.byteswap()
+        f.write(memoryview(Values).cast("B"))
+
+    ## Function required for Load
+    #  returns uint32 array of the buffer without copying (copied on big endian systems)
+    @staticmethod
+    def __ReadArray(View,Position,Count):
+        Values=View[Position:Position+Count*4].cast("I")
+        if sys.byteorder != "little":
+            Values=array.array("I",Values)
+            Values.byteswap()
+        return Values
+
+
+## Class INFDatabase - SQLite database of parsed INF files
+#  Tables:
+#  table         |  columns                                                                  |
+#  ------------- |-------------------------------------------------------------------------- |
+#  files         |id, path, hash, size, mtime_ns, class, provider, driver_date, driver_version |
+#  sections      |id, file_id, position, name                                                |
+#  rows          |file_id, section_id, position, key, value, comment                         |
+#  hardware_ids  |file_id, hardware_id, models, install, description                          |
+#
+#  Section names, keys and hardware IDs are case-insensitive (COLLATE NOCASE) and indexed,
+#  driver_date is YYYY-MM-DD. Files are identified by path and content hash, unchanged files are skipped.
+#  \code{.py}
+#  Database = INFDatabase("./drivers.db")
+#  Database.Update(glob.glob("./DriverStore/**/*.inf", recursive=True), fPrune=True)
+#  for Path, in Database.Execute("SELECT path FROM files WHERE class = 'Display' AND driver_date < '2020-01-01'"):
+#      print(Path)
+#  Database.Close()
+#  \endcode
+#
+class INFDatabase:
+    ## Database schema version
+    Version=1
+
+    __Schema=(
+        "CREATE TABLE IF NOT EXISTS files(id INTEGER PRIMARY KEY, path TEXT UNIQUE NOT NULL, hash TEXT NOT NULL,"
+        " size INTEGER, mtime_ns INTEGER, class TEXT COLLATE NOCASE, provider TEXT, driver_date TEXT, driver_version TEXT)",
+        "CREATE TABLE IF NOT EXISTS sections(id INTEGER PRIMARY KEY, file_id INTEGER NOT NULL, position INTEGER,"
+        " name TEXT COLLATE NOCASE)",
+        "CREATE TABLE IF NOT EXISTS rows(file_id INTEGER NOT NULL, section_id INTEGER NOT NULL, position INTEGER,"
+        " key TEXT COLLATE NOCASE, value TEXT, comment TEXT)",
+        "CREATE TABLE IF NOT EXISTS hardware_ids(file_id INTEGER NOT NULL, hardware_id TEXT COLLATE NOCASE,"
+        " models TEXT, install TEXT, description TEXT)",
+        "CREATE INDEX IF NOT EXISTS sections_name ON sections(name)",
+        "CREATE INDEX IF NOT EXISTS sections_file ON sections(file_id)",
+        "CREATE INDEX IF NOT EXISTS rows_key ON rows(key)",
+        "CREATE INDEX IF NOT EXISTS rows_section ON rows(section_id)",
+        "CREATE INDEX IF NOT EXISTS rows_file ON rows(file_id)",
+        "CREATE INDEX IF NOT EXISTS hardware_ids_id ON hardware_ids(hardware_id)",
+        "CREATE INDEX IF NOT EXISTS hardware_ids_file ON hardware_ids(file_id)",
+        "CREATE INDEX IF NOT EXISTS files_class ON files(class)",
+    )
+
+    ## Default constructor, creates tables if the database is empty
+    #  @param Path (str) database file name, ":memory:" for in-memory database
+    #  @exception INFError if the database has unsupported version
+    def __init__(self,Path):
+        self.__Connection=sqlite3.connect(Path)
+        Version=self.__Connection.execute("PRAGMA user_version").fetchone()[0]
+        if Version not in (0,INFDatabase.Version):
+            self.__Connection.close()
+            raise INFError(INFDiagnostic(INFDiagnostics.unsupported_version,INFDiagnostics.error,Path,None,("database",Version)))
+
+        with self.__Connection:
+            for Statement in INFDatabase.__Schema:
+                self.__Connection.execute(Statement)
+            self.__Connection.execute("PRAGMA user_version={0}".format(INFDatabase.Version))
+
+    ## Returns database connection
+    #  @return sqlite3.Connection
+    def GetConnection(self):
+        return self.__Connection
+
+    ## Runs SQL query
+    #  @param SQL (str)
+    #  @param Parameters (tuple or dict)
+    #  @return list of tuple
+    def Execute(self,SQL,Parameters=()):
+        return self.__Connection.execute(SQL,Parameters).fetchall()
+
+    ## Closes database
+    def Close(self):
+        self.__Connection.close()
+
+    ## Returns stored file names
+    #  @return list
+    def Files(self):
+        return [Path for Path, in self.__Connection.execute("SELECT path FROM files ORDER BY path")]
+
+    ## Adds or updates INF files in one transaction. Files with the same size and modification time
+    #  are skipped, files with the same content hash are not parsed again.
+    #  @param Paths iterable of str
+    #  @param codec (str) if None, the encoding is detected (see WinINF.ParseBytes)
+    #  @param fPrune (bool) removes stored files that are not in Paths
+    #  @return dict {"changed": [paths], "unchanged": int, "removed": [paths], "failed": {path: message}}
+    def Update(self,Paths,codec=None,fPrune=False):
+        Returner={"changed":[],"unchanged":0,"removed":[],"failed":{}}
+        Known={Path:(Id,Hash,Size,Time) for Id,Path,Hash,Size,Time in
+               self.__Connection.execute("SELECT id, path, hash, size, mtime_ns FROM files")}
+
+        with self.__Connection:
+            Seen=set()
+            for Path in Paths:
+                Seen.add(Path)
+                try:
+                    if self.__UpdateFile(Path,codec,Known.get(Path)):
+                        Returner["changed"].append(Path)
+                    else:
+                        Returner["unchanged"]+=1
+                except (OSError,ValueError) as e:
+                    Returner["failed"][Path]=str(e)
+
+            if fPrune:
+                for Path,(Id,Hash,Size,Time) in Known.items():
+                    if Path not in Seen:
+                        self.__Delete(Id)
+                        Returner["removed"].append(Path)
+        return Returner
+
+    ## Adds or updates one INF file (see Update)
+    #  @param Path (str)
+    #  @param codec (str)
+    #  @return bool True if the file was added or changed
+    def AddFile(self,Path,codec=None):
+        Row=self.__Connection.execute("SELECT id, hash, size, mtime_ns FROM files WHERE path=?",(Path,)).fetchone()
+        with self.__Connection:
+            return self.__UpdateFile(Path,codec,Row)
+
+    ## Removes file from the database
+    #  @param Path (str)
+    def RemoveFile(self,Path):
+        with self.__Connection:
+            for Id, in self.__Connection.execute("SELECT id FROM files WHERE path=?",(Path,)).fetchall():
+                self.__Delete(Id)
+
+    ## Function required for Update
+    #  @param Path (str)
+    #  @param codec (str)
+    #  @param Known (tuple) stored (id, hash, size, mtime_ns) or None
+    #  @return bool
+    def __UpdateFile(self,Path,codec,Known):
+        st=os.stat(Path)
+        if Known is not None and Known[2] == st.st_size and Known[3] == st.st_mtime_ns:
+            return False
+
+        with open(Path,"rb") as f:
+            Data=f.read()
+        Hash=hashlib.sha256(Data).hexdigest()
+
+        if Known is not None and Known[1] == Hash:
+            self.__Connection.execute("UPDATE files SET size=?, mtime_ns=? WHERE id=?",(st.st_size,st.st_mtime_ns,Known[0]))
+            return False
+
+        Inf=WinINF()
+        Inf.SetDiagnostics(INFDiagnostics(INFDiagnostics.silent))
+        Inf.ParseBytes(Data,codec,Path)
+
+        if Known is not None:
+            self.__Delete(Known[0])
+        self.__Insert(Inf,Path,Hash,st.st_size,st.st_mtime_ns)
+        return True
+
+    ## Function required for Update
+    #  writes file, sections, rows and hardware IDs
+    def __Insert(self,Inf,Path,Hash,Size,Time):
+        Class,Provider,Date,Version=INFDatabase.__GetVersion(Inf)
+        Cursor=self.__Connection.execute(
+            "INSERT INTO files(path, hash, size, mtime_ns, class, provider, driver_date, driver_version) VALUES (?,?,?,?,?,?,?,?)",
+            (Path,Hash,Size,Time,Class,Provider,Date,Version))
+        FileId=Cursor.lastrowid
+
+        SectionId=self.__Connection.execute("SELECT COALESCE(MAX(id),0) FROM sections").fetchone()[0]
+        Sections=[]
+        Rows=[]
+        for Position,Section in enumerate(Inf):
+            SectionId+=1
+            Sections.append((SectionId,FileId,Position,Section.GetName()))
+            for Index,(k,v,c) in enumerate(Section):
+                if k or c:
+                    Rows.append((FileId,SectionId,Index,k.strip() if k else "",v.strip() if v else "",c or ""))
+
+        self.__Connection.executemany("INSERT INTO sections(id, file_id, position, name) VALUES (?,?,?,?)",Sections)
+        self.__Connection.executemany("INSERT INTO rows(file_id, section_id, position, key, value, comment) VALUES (?,?,?,?,?,?)",Rows)
+        self.__Connection.executemany("INSERT INTO hardware_ids(file_id, hardware_id, models, install, description) VALUES (?,?,?,?,?)",
+                                      ((FileId,)+Row for Row in INFHardwareIndex.GetIDs(Inf)))
+
+    ## Function required for Update
+    #  removes file and its sections, rows and hardware IDs
+    def __Delete(self,FileId):
+        for Table in ("rows","sections","hardware_ids"):
+            self.__Connection.execute("DELETE FROM {0} WHERE file_id=?".format(Table),(FileId,))
+        self.__Connection.execute("DELETE FROM files WHERE id=?",(FileId,))
+
+    ## Function required for Update
+    #  reads Class, Provider and DriverVer from [Version] section
+    #  @param Inf (WinINF)
+    #  @return (class, provider, driver date YYYY-MM-DD, driver version)
+    @staticmethod
+    def __GetVersion(Inf):
+        Values={}
+        for Section in Inf.GetSections("version"):
+            for Index,(k,v,c) in enumerate(Section):
+                if k and v:
+                    Values[k.strip().casefold()]=(v,Section.GetFields(Index))
+
+        def Get(Key):
+            Value=Values.get(Key)
+            return Inf.Resolve(Value[1][0]) if Value is not None else None
+
+        Date=None
+        Version=None
+        DriverVer=Values.get("driverver")
+        if DriverVer is not None:
+            Fields=DriverVer[1]
+            Parts=Fields[0].split('/')
+            if len(Parts) == 3 and all(p.isdigit() for p in Parts):
+                Date="{0:04d}-{1:02d}-{2:02d}".format(int(Parts[2]),int(Parts[0]),int(Parts[1]))
+            if len(Fields) > 1:
+                Version=Fields[1]
+        return Get("class"),Get("provider"),Date,Version
+
+
+## Change of INF file found by INFWatcher
+#  type      |  description                                                  |
+#  --------- |-------------------------------------------------------------- |
+#  added     |new file, Sections - all section names, Inf - parsed file      |
+#  changed   |Sections - added, removed and changed sections, Inf - parsed file |
+#  removed   |file is deleted, Sections - all section names of the old file  |
+#  failed    |file can't be read or parsed, Error - exception                |
+#
+class INFChange:
+    added="added"
+    changed="changed"
+    removed="removed"
+    failed="failed"
+
+    __slots__=("Type","Path","Sections","Inf","Error")
+
+    ## Default constructor
+    def __init__(self,Type,Path,Sections=(),Inf=None,Error=None):
+        self.Type=Type
+        self.Path=Path
+        self.Sections=list(Sections)
+        self.Inf=Inf
+        self.Error=Error
+
+    def __repr__(self):
+        return "INFChange({0!r}, {1!r}, {2!r})".format(self.Type,self.Path,self.Sections)
+
+
+## Class INFWatcher - incremental indexer of INF files in a directory
+#  Every refresh checks size and modification time of all files, new and changed files are parsed,
+#  deleted files are removed from the manifest. Manifest (size, mtime, hash and section fingerprints of
+#  every file) is stored in a JSON file, so only changes made since the last run are reported after restart.
+#  \code{.py}
+#  Index = INFHardwareIndex()
+#  Watcher = INFWatcher("./DriverStore", "./manifest.json", fRecursive=True)
+#  for Changes in Watcher.Watch(10):
+#      for Change in Changes:
+#          if Change.Type == INFChange.removed:
+#              Index.RemoveFile(Change.Path)
+#          elif Change.Inf is not None:
+#              Index.AddFile(Change.Inf)
+#  \endcode
+#
+class INFWatcher:
+    ## Manifest format version
+    Version=1
+
+    ## Default constructor
+    #  @param Path (str) directory
+    #  @param Manifest (str) manifest file name, if None the manifest is kept in memory only
+    #  @param pattern (str) glob pattern
+    #  @param fRecursive (bool) search in subdirectories
+    #  @param codec (str) if None, the encoding is detected (see WinINF.ParseBytes)
+    #  @param Diagnostics (INFDiagnostics) manifest messages, if None, messages are printed
+    def __init__(self,Path,Manifest=None,pattern="*.inf",fRecursive=False,codec=None,Diagnostics=None):
+        self.__Path=Path
+        self.__Manifest=Manifest
+        self.__Pattern=os.path.join("**",pattern) if fRecursive else pattern
+        self.__Recursive=fRecursive
+        self.__Codec=codec
+        self.__Files={}
+        self.__Dirty=False
+
+        if Manifest is not None and os.path.exists(Manifest):
+            if Diagnostics is None:
+                Diagnostics=INFDiagnostics.Default
+            # a broken manifest is reported and all files are checked again
+            try:
+                with open(Manifest,encoding="utf-8") as f:
+                    Data=json.load(f)
+            except (ValueError,OSError):
+                Data=None
+            if not isinstance(Data,dict):
+                Diagnostics.Report(INFDiagnostics.invalid_format,Manifest,None,"manifest")
+            elif Data.get("version") != INFWatcher.Version:
+                Diagnostics.Report(INFDiagnostics.unsupported_version,Manifest,None,"manifest",Data.get("version"))
+            elif not isinstance(Data.get("files"),dict):
+                Diagnostics.Report(INFDiagnostics.invalid_format,Manifest,None,"manifest")
+            else:
+                self.__Files=Data["files"]
+
+    ## Returns file names from the manifest
+    #  @return list
+    def Files(self):
+        return sorted(self.__Files.keys())
+
+    ## Returns manifest entry of the file
+    #  @param Name (str)
+    #  @return (size, mtime_ns, hash) or None
+    def GetEntry(self,Name):
+        Entry=self.__Files.get(Name)
+        return tuple(Entry[:3]) if Entry is not None else None
+
+    ## Checks all files of the directory and returns changes since the last refresh
+    #  @return list of INFChange
+    def Refresh(self):
+        Changes=[]
+        Seen=set()
+        for Name in sorted(glob.glob(os.path.join(glob.escape(self.__Path),self.__Pattern),recursive=self.__Recursive)):
+            Seen.add(Name)
+            Change=self.__Check(Name)
+            if Change is not None:
+                Changes.append(Change)
+
+        for Name in sorted(set(self.__Files)-Seen):
+            Entry=self.__Files.pop(Name)
+            Changes.append(INFChange(INFChange.removed,Name,[n for n,Fingerprint in Entry[3]]))
+
+        if (Changes or self.__Dirty) and self.__Manifest is not None:
+            self.Save()
+        return Changes
+
+    ## Refreshes files every Interval seconds and returns changes, stops after Count refreshes
+    #  @param Interval (float) seconds
+    #  @param Count (int) if None, works until the loop is stopped
+    #  @param fEmpty (bool) returns empty lists when nothing is changed
+    #  @return generator of list of INFChange
+    def Watch(self,Interval=5.0,Count=None,fEmpty=False):
+        for i in (itertools.count() if Count is None else range(Count)):
+            if i:
+                time.sleep(Interval)
+            Changes=self.Refresh()
+            if Changes or fEmpty:
+                yield Changes
+
+    ## Saves manifest
+    #  @param Name (str) if None, the manifest file of the constructor is used
+    def Save(self,Name=None):
+        if Name is None:
+            Name=self.__Manifest
+
+        TmpName="{0}.{1}.tmp".format(Name,os.getpid())
+        with open(TmpName,"w",encoding="utf-8") as f:
+            json.dump({"version":INFWatcher.Version,"files":self.__Files},f)
+        os.replace(TmpName,Name)
+        self.__Dirty=False
+
+    ## Function required for Refresh
+    #  checks one file
+    #  @param Name (str)
+    #  @return INFChange or None
+    def __Check(self,Name):
+        Entry=self.__Files.get(Name)
+        try:
+            st=os.stat(Name)
+            if Entry is not None and Entry[0] == st.st_size and Entry[1] == st.st_mtime_ns:
+                return None
+
+            with open(Name,"rb") as f:
+                Data=f.read()
+            Hash=hashlib.sha256(Data).hexdigest()
+            if Entry is not None and Entry[2] == Hash:
+                Entry[0]=st.st_size
+                Entry[1]=st.st_mtime_ns
+                self.__Dirty=True
+                return None
+
+            Inf=WinINF()
+            Inf.SetDiagnostics(INFDiagnostics(INFDiagnostics.collect))
+            Inf.ParseBytes(Data,self.__Codec,Name)
+        except (OSError,ValueError) as e:
+            return INFChange(INFChange.failed,Name,Error=e)
+
+        Sections=[[Section.GetName(),Section.GetFingerprint().hex()] for Section in Inf if Section.GetName().rstrip()]
+        self.__Files[Name]=[st.st_size,st.st_mtime_ns,Hash,Sections]
+        if Entry is None:
+            return INFChange(INFChange.added,Name,[n for n,Fingerprint in Sections],Inf)
+        return INFChange(INFChange.changed,Name,INFWatcher.__Compare(Entry[3],Sections),Inf)
+
+    ## Function required for Refresh
+    #  returns names of added, removed and changed sections (sections with the same name are merged)
+    #  @param Old list of [name, fingerprint]
+    #  @param New list of [name, fingerprint]
+    #  @return list of str
+    @staticmethod
+    def __Compare(Old,New):
+        def Group(Sections):
+            Returner={}
+            for Name,Fingerprint in Sections:
+                Returner.setdefault(Name.casefold(),(Name,[]))[1].append(Fingerprint)
+            return Returner
+
+        OldGroups=Group(Old)
+        NewGroups=Group(New)
+        Names=[]
+        for Key,(Name,Fingerprints) in NewGroups.items():
+            OldGroup=OldGroups.get(Key)
+            if OldGroup is None or OldGroup[1] != Fingerprints:
+                Names.append(Name)
+        for Key,(Name,Fingerprints) in OldGroups.items():
+            if Key not in NewGroups:
+                Names.append(Name)
+        return Names
+
+
+## Function required for WinINF.ParseFileAsync
+#  parses file in a worker thread or process
+#  @param Name (str)
+#  @param codec (str)
+#  @param fLazy (bool)
+#  @param fKeepRaw (bool)
+#  @return WinINF
+def _ParseFileWorker(Name,codec=None,fLazy=False,fKeepRaw=False):
+    Inf=WinINF()
+    Inf.ParseFile(Name,codec,fLazy,fKeepRaw)
+    return Inf
+
+
+## Function required for WinINF.ParseMany
+#  parses files in a worker process, collects diagnostics and errors
+#  @param Names list of str
+#  @param codec (str)
+#  @return list of (str, WinINF or Exception, list)
+def _ParseFilesWorker(Names,codec=None):
+    Returner=[]
+    for Name in Names:
+        Diagnostics=INFDiagnostics(INFDiagnostics.collect)
+        try:
+            Inf=WinINF()
+            Inf.SetDiagnostics(Diagnostics)
+            if codec is None:
+                with open(Name,"rb") as f:
+                    Inf.ParseStream(f,Name=Name)
+            else:
+                Inf.ParseFile(Name,codec)
+        except Exception as e:
+            Inf=e
+        Returner.append((Name,Inf,list(Diagnostics)))
+    return Returner